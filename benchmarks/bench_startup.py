@@ -0,0 +1,92 @@
+"""notion_google_sync 시작 시간 벤치마크
+
+새 파이썬 프로세스에서 모듈 import 시간과 Google Tasks 서비스 생성(build) 시간을
+여러 번 재고 중앙값을 출력합니다. import 시간이 기준을 넘거나, 시작할 때 불러오면
+안 되는 무거운 모듈이 import되면 종료 코드 1로 끝나므로 회귀 확인에 사용할 수 있습니다.
+
+    python benchmarks/bench_startup.py [--runs 5] [--max-import-ms 300]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시점에는 불러오지 않아야 하는 모듈 (필요할 때 함수 안에서 import)
+DEFERRED_MODULES = [
+    'telegram',
+    'google_auth_oauthlib',
+    'googleapiclient.discovery',
+    'notion_client.client',
+    'httpx',
+]
+
+# 모듈 import에 필요한 환경 변수 (실제 API는 호출하지 않음)
+DUMMY_ENV = {
+    'NOTION_TOKEN': 'benchmark',
+    'NOTION_DATABASE_ID': 'benchmark',
+    'GOOGLE_TASKLIST_ID': 'benchmark',
+    'TELEGRAM_BOT_TOKEN': 'benchmark',
+    'TELEGRAM_CHAT_ID': 'benchmark',
+}
+
+IMPORT_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import notion_google_sync
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    'import_ms': elapsed * 1000,
+    'loaded': [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+}}))
+"""
+
+BUILD_PROBE = """
+import json, time
+started = time.perf_counter()
+from googleapiclient.discovery import build
+build('tasks', 'v1', developerKey='benchmark', static_discovery=True, cache_discovery=False)
+print(json.dumps({'build_ms': (time.perf_counter() - started) * 1000}))
+"""
+
+def run_probe(code: str) -> dict:
+    env = {**os.environ, **DUMMY_ENV}
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='notion_google_sync 시작 시간 벤치마크')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-import-ms', type=float, default=300.0,
+                        help='import 시간 중앙값이 이 값을 넘으면 실패로 처리')
+    args = parser.parse_args()
+
+    imports = [run_probe(IMPORT_PROBE) for _ in range(args.runs)]
+    builds = [run_probe(BUILD_PROBE) for _ in range(args.runs)]
+
+    import_ms = statistics.median(result['import_ms'] for result in imports)
+    build_ms = statistics.median(result['build_ms'] for result in builds)
+    loaded = sorted({name for result in imports for name in result['loaded']})
+
+    print(f"모듈 import: {import_ms:.1f}ms (중앙값, {args.runs}회)")
+    print(f"Tasks 서비스 생성: {build_ms:.1f}ms (discovery import 포함)")
+
+    failed = False
+    if import_ms > args.max_import_ms:
+        print(f"✗ import 시간이 기준({args.max_import_ms:.0f}ms)을 넘었습니다.")
+        failed = True
+    if loaded:
+        print(f"✗ 시작 시 불러오면 안 되는 모듈이 import되었습니다: {', '.join(loaded)}")
+        failed = True
+    if not failed:
+        print("✓ 시작 시간 기준을 통과했습니다.")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""NotionGoogleTasksSync.sync_tasks 종단 간 벤치마크 (실제 계정 없이 실행)
+
+benchmarks/fakes.py의 Notion / Google Tasks 대역에 시나리오별 데이터를 채우고
+sync_tasks를 실행해 실행 시간, 최대 메모리(tracemalloc), 엔드포인트별 API 호출 수와
+응답 크기를 출력합니다. 동기화 방식을 바꾼 뒤 같은 명령으로 전후를 비교하면 됩니다.
+
+    python benchmarks/bench_sync.py --scenario initial --size 10000
+    python benchmarks/bench_sync.py --scenario completions --size 100000 --change-ratio 0.01 --json
+    python benchmarks/bench_sync.py --scenario steady --latency-ms 80 --notion-rate 3 --google-rate 50
+
+시나리오:
+    initial      아직 업로드되지 않은 Notion 작업 전체를 처음 동기화
+    steady       모두 연결된 상태에서 변경 없이 증분 동기화
+    completions  Google에서 change-ratio만큼 완료 처리한 뒤 증분 동기화
+    edits        Notion 제목과 Google 마감일을 change-ratio만큼 바꾼 뒤 증분 동기화
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime, timedelta, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# notion_google_sync를 import하기 전에 필요한 환경 변수 (실제 API는 호출하지 않음)
+BENCHMARK_ENV = {
+    'NOTION_TOKEN': 'benchmark',
+    'NOTION_DATABASE_ID': 'benchmark',
+    'GOOGLE_TASKLIST_ID': 'benchmark',
+    'TELEGRAM_BOT_TOKEN': '',
+    'TELEGRAM_CHAT_ID': '',
+}
+
+SCENARIOS = ('initial', 'steady', 'completions', 'edits')
+
+# 시나리오 데이터는 하루 전에 마지막으로 수정된 것으로 만듭니다 (증분 범위 밖).
+FIXTURE_AGE = timedelta(days=1)
+
+def build_fixture(scenario: str, size: int, notion, google):
+    """시나리오의 시작 상태를 두 대역에 채움"""
+    from fakes import make_google_task, make_notion_page, rich_text
+
+    edited = datetime.now(timezone.utc) - FIXTURE_AGE
+    base_due = edited.date()
+    for i in range(size):
+        title = f"습관 {i % 50}"  # 같은 이름이 반복되는 습관 목록
+        due = (base_due + timedelta(days=i % 30)).isoformat()
+        memo = f"벤치마크 작업 {i}의 메모입니다. " * 3
+        if scenario == 'initial':
+            notion.add_page(make_notion_page(notion.database_id, title, due, memo=memo, edited=edited))
+            continue
+        page = make_notion_page(notion.database_id, title, due, uploaded=True, memo=memo, edited=edited)
+        task = make_google_task(title, notes=f"Notion Task ID: {page['id']}", due=due, updated=edited)
+        page['properties']['remark']['rich_text'] = rich_text(f"Google Task ID: {task['id']}")
+        notion.add_page(page)
+        google.add_task(task)
+
+def apply_changes(scenario: str, change_ratio: float, notion, google) -> int:
+    """준비 실행 뒤, 측정 실행 전에 한쪽에서 일어난 변경을 흉내 냄"""
+    if scenario not in ('completions', 'edits'):
+        return 0
+    count = int(len(google.store) * change_ratio)
+    tasks = list(google.store.values())[:count]
+    for i, task in enumerate(tasks):
+        if scenario == 'completions':
+            google.store_task({**task, 'status': 'completed'})
+        elif i % 2:
+            google.store_task({**task, 'due': '2099-01-01T00:00:00.000Z'})
+    if scenario == 'edits':
+        for page in list(notion.pages.values())[:count:2]:
+            notion.apply_update(page['id'], {'이름': {'title': [{'text': {'content': '이름 바뀐 작업'}}]}})
+    return count
+
+def run_sync(sync, full: bool, quiet: bool):
+    output = open(os.devnull, 'w') if quiet else sys.stdout
+    try:
+        with contextlib.redirect_stdout(output):
+            return sync.sync_tasks(full=full)
+    finally:
+        if quiet:
+            output.close()
+
+def format_bytes(value: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{value:.1f}{unit}"
+        value /= 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='sync_tasks 오프라인 벤치마크')
+    parser.add_argument('--scenario', choices=SCENARIOS, default='initial')
+    parser.add_argument('--size', type=int, default=1000, help='Notion 작업 수')
+    parser.add_argument('--change-ratio', type=float, default=0.05,
+                        help='completions/edits 시나리오에서 바뀌는 작업 비율')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='요청 한 번의 응답 지연')
+    parser.add_argument('--notion-rate', type=float, default=0.0,
+                        help='Notion 대역의 초당 요청 한도 (0이면 제한 없음)')
+    parser.add_argument('--google-rate', type=float, default=0.0,
+                        help='Google 대역의 초당 요청 한도 (0이면 제한 없음)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='429 응답의 Retry-After(초)')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 측정 생략 (더 빠름)')
+    parser.add_argument('--verbose', action='store_true', help='동기화 출력을 그대로 표시')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    state_dir = tempfile.mkdtemp(prefix='bench-sync-')
+    os.environ.update(BENCHMARK_ENV)
+    os.environ['SYNC_STATE_DIR'] = state_dir
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fakes import FakeAsyncNotionClient, FakeNotionClient, FakeNotionStore, FakeTasksApi
+    from notion_google_sync import NotionGoogleTasksSync
+    from transport import get_transport
+
+    limits = {'latency': args.latency_ms / 1000, 'retry_after': args.retry_after}
+    notion = FakeNotionStore(BENCHMARK_ENV['NOTION_DATABASE_ID'], **limits)
+    google = FakeTasksApi(BENCHMARK_ENV['GOOGLE_TASKLIST_ID'], **limits)
+    build_fixture(args.scenario, args.size, notion, google)
+
+    sync = NotionGoogleTasksSync(notion=FakeNotionClient(notion), tasks_service=google,
+                                 notion_async_client=FakeAsyncNotionClient(notion))
+    try:
+        warmup = None
+        if args.scenario != 'initial':
+            # 연결 색인과 워터마크를 만드는 준비 실행 (측정하지 않음)
+            started = time.perf_counter()
+            run_sync(sync, full=True, quiet=not args.verbose)
+            warmup = time.perf_counter() - started
+        changed = apply_changes(args.scenario, args.change_ratio, notion, google)
+
+        # 요청 한도는 측정 실행에만 적용합니다.
+        notion.rate_limit = args.notion_rate or None
+        google.rate_limit = args.google_rate or None
+        if args.notion_rate:
+            sync.notion_writer.bucket.rate = args.notion_rate
+        else:
+            sync.notion_writer.bucket.rate = sync.notion_writer.bucket.capacity = 1e9
+        notion.reset_stats()
+        google.reset_stats()
+
+        if not args.no_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        writes = run_sync(sync, full=args.scenario == 'initial', quiet=not args.verbose)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if not args.no_memory else None
+        if not args.no_memory:
+            tracemalloc.stop()
+    finally:
+        get_transport().close()
+        sync.id_map.close()
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    result = {
+        'scenario': args.scenario,
+        'size': args.size,
+        'changed': changed,
+        'warmup_seconds': warmup,
+        'wall_seconds': elapsed,
+        'peak_memory_bytes': peak,
+        'writes': writes,
+        'errors': len(sync.errors),
+        'notion': notion.stats(),
+        'google': google.stats(),
+        'phases': dict(sync.metrics.phases),
+    }
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+
+    print(f"시나리오 {args.scenario}: 작업 {args.size}개, 변경 {changed}개")
+    if warmup is not None:
+        print(f"준비 실행: {warmup:.2f}초")
+    print(f"실행 시간: {elapsed:.2f}초")
+    if peak is not None:
+        print(f"최대 메모리: {format_bytes(peak)}")
+    print(f"기록한 변경: {writes}개, 오류: {len(sync.errors)}개")
+    print("단계별 시간: " + ', '.join(f"{name} {seconds:.2f}초" for name, seconds in sync.metrics.phases.items()))
+    for name, api in (('Notion', notion), ('Google', google)):
+        stats = api.stats()
+        print(f"\n{name}: HTTP 요청 {stats['round_trips']}회")
+        for endpoint, calls in sorted(stats['calls'].items()):
+            line = f"  {endpoint:<18} {calls:>7}회  {format_bytes(stats['response_bytes'].get(endpoint, 0)):>9}"
+            if stats['rate_limited'].get(endpoint):
+                line += f"  (429 {stats['rate_limited'][endpoint]}회)"
+            print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,701 @@
+"""벤치마크용 Notion / Google Tasks API 대역 (프로세스 안에서 동작)
+
+실제 클라이언트와 같은 호출 형태(notion.databases.query(...),
+service.tasks().list(...).execute())를 제공하고, 응답 지연, 요청 한도(429),
+페이지네이션을 흉내 냅니다. 응답은 매번 JSON으로 직렬화했다가 다시 읽어
+실제 클라이언트처럼 새 객체를 돌려주며, 엔드포인트별 호출 수와 응답 크기를 셉니다.
+"""
+import json
+import time
+import uuid
+import asyncio
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httplib2
+import httpx
+from googleapiclient.errors import HttpError
+from notion_client.errors import APIErrorCode, APIResponseError
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _format(value: datetime) -> str:
+    return value.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _parse_date(value: str) -> datetime:
+    """날짜('2024-01-01')나 시각 문자열을 UTC datetime으로 변환"""
+    parsed = _parse(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+class SimulatedApi:
+    """응답 지연, 초당 요청 한도, 호출 통계를 관리하는 공통 부분
+
+    rate_limit(초당 요청 수)을 넘는 요청은 토큰 버킷이 빌 때까지 429로 거절합니다.
+    """
+
+    def __init__(self, latency: float = 0.0, rate_limit: Optional[float] = None,
+                 retry_after: float = 1.0):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.calls: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.response_bytes: Counter = Counter()
+        self.round_trips = 0
+        self._tokens = float(rate_limit or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _admit(self, endpoint: str) -> bool:
+        with self._lock:
+            self.calls[endpoint] += 1
+            if not self.rate_limit:
+                return True
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens < 1:
+                self.rate_limited[endpoint] += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    async def async_round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def respond(self, endpoint: str, payload):
+        """응답을 JSON으로 직렬화해 크기를 세고, 새로 읽은 객체를 반환"""
+        body = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            self.response_bytes[endpoint] += len(body.encode())
+        return json.loads(body)
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.rate_limited.clear()
+            self.response_bytes.clear()
+            self.round_trips = 0
+
+    def stats(self) -> Dict:
+        return {
+            'round_trips': self.round_trips,
+            'calls': dict(self.calls),
+            'rate_limited': dict(self.rate_limited),
+            'response_bytes': dict(self.response_bytes),
+        }
+
+# ---------------------------------------------------------------------------
+# Notion
+# ---------------------------------------------------------------------------
+
+# 동기화가 사용하는 속성과, 읽지 않지만 실제 데이터베이스에 흔히 있는 속성
+NOTION_SCHEMA = {
+    '이름': {'id': 'title', 'type': 'title'},
+    '날짜': {'id': 'Dt%3Aa', 'type': 'date'},
+    'remark': {'id': 'Rm%3Bk', 'type': 'rich_text'},
+    '완료여부': {'id': 'Dn%5Ef', 'type': 'checkbox'},
+    'google 업로드': {'id': 'Gu%3Ep', 'type': 'select'},
+    '메모': {'id': 'Mm%40o', 'type': 'rich_text'},
+    '태그': {'id': 'Tg%3Fs', 'type': 'multi_select'},
+    '우선순위': {'id': 'Pr%7Ci', 'type': 'select'},
+}
+
+SELECT_COLORS = {'완료': 'green', '높음': 'red', '보통': 'yellow', '낮음': 'gray'}
+
+def rich_text(content: str) -> List[Dict]:
+    if not content:
+        return []
+    return [{
+        'type': 'text',
+        'text': {'content': content, 'link': None},
+        'annotations': {'bold': False, 'italic': False, 'strikethrough': False,
+                        'underline': False, 'code': False, 'color': 'default'},
+        'plain_text': content,
+        'href': None,
+    }]
+
+def _select_option(name: Optional[str]) -> Optional[Dict]:
+    if not name:
+        return None
+    return {'id': uuid.uuid5(uuid.NAMESPACE_URL, name).hex[:4], 'name': name,
+            'color': SELECT_COLORS.get(name, 'default')}
+
+def _plain_text(items: List[Dict]) -> str:
+    return ''.join(item.get('plain_text') or item.get('text', {}).get('content', '') for item in items)
+
+def notion_last_edited(value: datetime) -> str:
+    # Notion의 last_edited_time은 분 단위로 잘립니다.
+    return _format(value.replace(second=0, microsecond=0))
+
+def make_notion_page(database_id: str, title: str, due: Optional[str] = None, uploaded: bool = False,
+                     remark: str = '', completed: bool = False, memo: str = '',
+                     edited: Optional[datetime] = None) -> Dict:
+    page_id = str(uuid.uuid4())
+    edited = notion_last_edited(edited or _now())
+    values = {
+        '이름': rich_text(title),
+        '날짜': {'start': due, 'end': None, 'time_zone': None} if due else None,
+        'remark': rich_text(remark),
+        '완료여부': completed,
+        'google 업로드': _select_option('완료' if uploaded else None),
+        '메모': rich_text(memo),
+        '태그': [_select_option('습관')],
+        '우선순위': _select_option('보통'),
+    }
+    return {
+        'object': 'page',
+        'id': page_id,
+        'created_time': edited,
+        'last_edited_time': edited,
+        'created_by': {'object': 'user', 'id': 'benchmark-user'},
+        'last_edited_by': {'object': 'user', 'id': 'benchmark-user'},
+        'cover': None,
+        'icon': None,
+        'parent': {'type': 'database_id', 'database_id': database_id},
+        'archived': False,
+        'in_trash': False,
+        'properties': {
+            name: {'id': schema['id'], 'type': schema['type'], schema['type']: values[name]}
+            for name, schema in NOTION_SCHEMA.items()
+        },
+        'url': f"https://www.notion.so/{page_id.replace('-', '')}",
+        'public_url': None,
+    }
+
+def _property_value(prop: Dict):
+    value = prop[prop['type']]
+    if prop['type'] in ('title', 'rich_text'):
+        return _plain_text(value)
+    if prop['type'] in ('select', 'status'):
+        return value['name'] if value else None
+    if prop['type'] == 'date':
+        return value['start'] if value else None
+    if prop['type'] == 'multi_select':
+        return [option['name'] for option in value]
+    return value
+
+def _compare(value, condition: Dict) -> bool:
+    for op, expected in condition.items():
+        if op == 'equals':
+            ok = value == expected
+        elif op == 'does_not_equal':
+            ok = value != expected
+        elif op == 'contains':
+            ok = expected in value if value is not None else False
+        elif op == 'does_not_contain':
+            ok = expected not in (value or '')
+        elif op == 'starts_with':
+            ok = (value or '').startswith(expected)
+        elif op == 'is_empty':
+            ok = value in (None, '', [])
+        elif op == 'is_not_empty':
+            ok = value not in (None, '', [])
+        elif op in ('on_or_after', 'after', 'on_or_before', 'before'):
+            if value is None:
+                return False
+            left, right = _parse_date(value), _parse_date(expected)
+            ok = {'on_or_after': left >= right, 'after': left > right,
+                  'on_or_before': left <= right, 'before': left < right}[op]
+        else:
+            raise ValueError(f"지원하지 않는 필터 조건: {op}")
+        if not ok:
+            return False
+    return True
+
+def matches_filter(page: Dict, query_filter: Optional[Dict]) -> bool:
+    """Notion databases.query 필터 평가 (and/or, 속성 필터, timestamp 필터)"""
+    if not query_filter:
+        return True
+    if 'and' in query_filter:
+        return all(matches_filter(page, item) for item in query_filter['and'])
+    if 'or' in query_filter:
+        return any(matches_filter(page, item) for item in query_filter['or'])
+    if 'timestamp' in query_filter:
+        field = query_filter['timestamp']
+        return _compare(page[field], query_filter[field])
+
+    prop = page['properties'].get(query_filter['property'])
+    if prop is None:
+        raise ValueError(f"없는 속성: {query_filter['property']}")
+    condition = next(value for key, value in query_filter.items() if key != 'property')
+    return _compare(_property_value(prop), condition)
+
+# remark에 적는 Google Task ID 표식 (notion_google_sync와 같은 값)
+GOOGLE_ID_MARKER = 'Google Task ID: '
+
+def _index_keys(page: Dict):
+    """색인에 쓰는 (remark의 Google Task ID, google 업로드 값)"""
+    remark = _property_value(page['properties']['remark'])
+    google_id = remark[len(GOOGLE_ID_MARKER):] if remark.startswith(GOOGLE_ID_MARKER) else None
+    return google_id, _property_value(page['properties']['google 업로드'])
+
+def _normalize_property(prop_type: str, value: Dict):
+    """pages.update 요청의 속성 값을 응답 형태로 변환"""
+    value = value[prop_type]
+    if prop_type in ('title', 'rich_text'):
+        return rich_text(_plain_text(value))
+    if prop_type in ('select', 'status'):
+        return _select_option(value['name']) if value else None
+    if prop_type == 'date':
+        return {'start': value['start'], 'end': value.get('end'), 'time_zone': None} if value else None
+    if prop_type == 'multi_select':
+        return [_select_option(option['name']) for option in value]
+    return value
+
+class FakeNotionStore(SimulatedApi):
+    """Notion 데이터베이스 하나의 페이지 저장소
+
+    remark의 Google Task ID와 google 업로드 값으로 페이지를 색인해, 동기화가 쓰는
+    조건(remark contains / select equals)은 모든 페이지를 훑지 않고 후보만 평가합니다.
+    대역의 필터 평가 시간이 측정한 실행 시간을 부풀리지 않도록 하기 위함입니다.
+    """
+
+    def __init__(self, database_id: str = 'benchmark', **kwargs):
+        super().__init__(**kwargs)
+        self.database_id = database_id
+        self.pages: Dict[str, Dict] = {}
+        # 페이지 ID -> 추가된 순서 (조회 결과를 추가 순서로 돌려주기 위함)
+        self._order: Dict[str, int] = {}
+        self._keys: Dict[str, tuple] = {}
+        self._by_google_id: Dict[str, set] = {}
+        self._by_upload: Dict[Optional[str], set] = {}
+        # remark가 'Google Task ID: ...' 형태가 아닌 페이지 (remark 조건마다 함께 평가)
+        self._other_remarks: set = set()
+
+    def add_page(self, page: Dict) -> Dict:
+        self._order.setdefault(page['id'], len(self._order))
+        self.pages[page['id']] = page
+        self._reindex(page)
+        return page
+
+    def _reindex(self, page: Dict):
+        page_id = page['id']
+        old = self._keys.get(page_id)
+        if old is not None:
+            google_id, upload = old
+            self._by_google_id.get(google_id, set()).discard(page_id)
+            self._by_upload.get(upload, set()).discard(page_id)
+            self._other_remarks.discard(page_id)
+        google_id, upload = self._keys[page_id] = _index_keys(page)
+        if google_id is not None:
+            self._by_google_id.setdefault(google_id, set()).add(page_id)
+        elif _property_value(page['properties']['remark']):
+            self._other_remarks.add(page_id)
+        self._by_upload.setdefault(upload, set()).add(page_id)
+
+    def _candidates(self, query_filter: Optional[Dict]) -> Optional[set]:
+        """필터를 만족할 수 있는 페이지 ID (색인으로 좁힐 수 없으면 None = 전체)
+
+        후보는 matches_filter로 다시 평가하므로 실제 결과보다 넓기만 하면 됩니다.
+        """
+        if not query_filter:
+            return None
+        if 'and' in query_filter:
+            sets = [ids for ids in map(self._candidates, query_filter['and']) if ids is not None]
+            return set.intersection(*sets) if sets else None
+        if 'or' in query_filter:
+            sets = [self._candidates(item) for item in query_filter['or']]
+            return None if any(ids is None for ids in sets) else set().union(*sets)
+
+        prop = query_filter.get('property')
+        if prop == 'remark':
+            expected = query_filter['rich_text'].get('contains', '')
+            if not expected.startswith(GOOGLE_ID_MARKER):
+                return None
+            # 대역의 Google Task ID는 모두 길이가 같아, 부분 일치는 같은 ID일 때뿐입니다.
+            google_id = expected[len(GOOGLE_ID_MARKER):].strip()
+            return self._by_google_id.get(google_id, set()) | self._other_remarks
+        if prop == 'google 업로드' and 'equals' in query_filter['select']:
+            return set(self._by_upload.get(query_filter['select']['equals'], ()))
+        return None
+
+    def rate_limit_error(self) -> APIResponseError:
+        response = httpx.Response(429, headers={'Retry-After': str(self.retry_after)},
+                                  json={'object': 'error', 'status': 429, 'code': 'rate_limited'})
+        return APIResponseError(response, 'Rate limited', APIErrorCode.RateLimited)
+
+    def not_found_error(self, page_id: str) -> APIResponseError:
+        response = httpx.Response(404, json={'object': 'error', 'status': 404, 'code': 'object_not_found'})
+        return APIResponseError(response, f"Could not find page with ID: {page_id}", APIErrorCode.ObjectNotFound)
+
+    def _project(self, page: Dict, filter_properties: Optional[List[str]]) -> Dict:
+        if not filter_properties:
+            return page
+        wanted = set(filter_properties)
+        return {**page, 'properties': {name: prop for name, prop in page['properties'].items()
+                                       if prop['id'] in wanted}}
+
+    def query(self, database_id: str, filter: Dict = None, start_cursor: str = None,
+              page_size: int = 100, filter_properties: List[str] = None, sorts=None) -> Dict:
+        endpoint = 'databases.query'
+        admitted = self._admit(endpoint)
+        self.round_trip()
+        if not admitted:
+            raise self.rate_limit_error()
+
+        page_size = min(page_size or 100, 100)
+        candidates = self._candidates(filter)
+        if candidates is None:
+            pages = list(self.pages.values())
+        else:
+            pages = [self.pages[page_id] for page_id in sorted(candidates, key=self._order.__getitem__)]
+        pages = [page for page in pages if matches_filter(page, filter)]
+        start = int(start_cursor) if start_cursor else 0
+        results = pages[start:start + page_size]
+        has_more = start + page_size < len(pages)
+        return self.respond(endpoint, {
+            'object': 'list',
+            'results': [self._project(page, filter_properties) for page in results],
+            'next_cursor': str(start + page_size) if has_more else None,
+            'has_more': has_more,
+            'type': 'page_or_database',
+            'page_or_database': {},
+        })
+
+    def retrieve_database(self, database_id: str) -> Dict:
+        endpoint = 'databases.retrieve'
+        admitted = self._admit(endpoint)
+        self.round_trip()
+        if not admitted:
+            raise self.rate_limit_error()
+        return self.respond(endpoint, {
+            'object': 'database',
+            'id': self.database_id,
+            'title': rich_text('벤치마크'),
+            'properties': {name: {'id': schema['id'], 'name': name, 'type': schema['type'],
+                                  schema['type']: {}}
+                           for name, schema in NOTION_SCHEMA.items()},
+        })
+
+    def retrieve_page(self, page_id: str, filter_properties: List[str] = None) -> Dict:
+        endpoint = 'pages.retrieve'
+        admitted = self._admit(endpoint)
+        self.round_trip()
+        if not admitted:
+            raise self.rate_limit_error()
+        page = self.pages.get(page_id)
+        if page is None:
+            raise self.not_found_error(page_id)
+        return self.respond(endpoint, self._project(page, filter_properties))
+
+    def apply_update(self, page_id: str, properties: Dict) -> Dict:
+        page = self.pages.get(page_id)
+        if page is None:
+            raise self.not_found_error(page_id)
+        with self._lock:
+            for name, value in properties.items():
+                prop = page['properties'][name]
+                prop[prop['type']] = _normalize_property(prop['type'], value)
+            page['last_edited_time'] = notion_last_edited(_now())
+            self._reindex(page)
+        return self.respond('pages.update', page)
+
+    def update_page(self, page_id: str, properties: Dict) -> Dict:
+        admitted = self._admit('pages.update')
+        self.round_trip()
+        if not admitted:
+            raise self.rate_limit_error()
+        return self.apply_update(page_id, properties)
+
+    async def async_update_page(self, page_id: str, properties: Dict) -> Dict:
+        admitted = self._admit('pages.update')
+        await self.async_round_trip()
+        if not admitted:
+            raise self.rate_limit_error()
+        return self.apply_update(page_id, properties)
+
+# 클래스 이름은 notion_client와 같게 두어 실행 통계의 엔드포인트 이름이 일치하도록 합니다.
+class DatabasesEndpoint:
+    def __init__(self, store: FakeNotionStore):
+        self.store = store
+
+    def query(self, database_id: str, **kwargs) -> Dict:
+        return self.store.query(database_id, **kwargs)
+
+    def retrieve(self, database_id: str, **kwargs) -> Dict:
+        return self.store.retrieve_database(database_id)
+
+class PagesEndpoint:
+    def __init__(self, store: FakeNotionStore):
+        self.store = store
+
+    def retrieve(self, page_id: str, **kwargs) -> Dict:
+        return self.store.retrieve_page(page_id, **kwargs)
+
+    def update(self, page_id: str, properties: Dict, **kwargs) -> Dict:
+        return self.store.update_page(page_id, properties)
+
+class AsyncPagesEndpoint:
+    def __init__(self, store: FakeNotionStore):
+        self.store = store
+
+    async def update(self, page_id: str, properties: Dict, **kwargs) -> Dict:
+        return await self.store.async_update_page(page_id, properties)
+
+class FakeNotionClient:
+    """notion_client.Client 대역"""
+
+    def __init__(self, store: FakeNotionStore):
+        self.databases = DatabasesEndpoint(store)
+        self.pages = PagesEndpoint(store)
+
+class FakeAsyncNotionClient:
+    """notion_client.AsyncClient 대역 (AsyncNotionWriter용)"""
+
+    def __init__(self, store: FakeNotionStore):
+        self.pages = AsyncPagesEndpoint(store)
+
+    async def aclose(self):
+        pass
+
+# ---------------------------------------------------------------------------
+# Google Tasks
+# ---------------------------------------------------------------------------
+
+def _parse_fields(fields: str) -> Dict[str, Optional[set]]:
+    """'nextPageToken,items(id,title)' -> {'nextPageToken': None, 'items': {'id', 'title'}}"""
+    parsed, depth, current = {}, 0, ''
+    for char in fields + ',':
+        if char == ',' and depth == 0:
+            name, _, inner = current.partition('(')
+            parsed[name.strip()] = set(inner.rstrip(')').split(',')) if inner else None
+            current = ''
+            continue
+        depth += (char == '(') - (char == ')')
+        current += char
+    return parsed
+
+def make_google_task(title: str, notes: str = '', due: Optional[str] = None,
+                     completed: bool = False, updated: Optional[datetime] = None) -> Dict:
+    updated = _format(updated or _now())
+    task_id = uuid.uuid4().hex[:22]
+    task = {
+        'kind': 'tasks#task',
+        'id': task_id,
+        'etag': f'"{uuid.uuid4().hex[:16]}"',
+        'title': title,
+        'updated': updated,
+        'selfLink': f"https://www.googleapis.com/tasks/v1/lists/benchmark/tasks/{task_id}",
+        'position': '00000000000000000000',
+        'status': 'completed' if completed else 'needsAction',
+        'links': [],
+        'webViewLink': f"https://tasks.google.com/task/{task_id}",
+    }
+    if notes:
+        task['notes'] = notes
+    if due:
+        task['due'] = f"{due}T00:00:00.000Z"
+    if completed:
+        task['completed'] = updated
+        task['hidden'] = True
+    return task
+
+class FakeRequest:
+    """googleapiclient HttpRequest 대역"""
+
+    def __init__(self, api: 'FakeTasksApi', method_id: str, handler):
+        self.api = api
+        self.methodId = method_id
+        self.handler = handler
+
+    def _run(self):
+        endpoint = self.methodId.split('.', 1)[1]
+        if not self.api._admit(endpoint):
+            raise self.api.rate_limit_error()
+        return self.api.respond(endpoint, self.handler())
+
+    def execute(self, http=None, num_retries: int = 0):
+        self.api.round_trip()
+        return self._run()
+
+class FakeBatch:
+    """googleapiclient BatchHttpRequest 대역 (하위 요청마다 요청 한도를 적용)"""
+
+    MAX_REQUESTS = 1000
+
+    def __init__(self, api: 'FakeTasksApi', callback=None):
+        self.api = api
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request: FakeRequest, callback=None, request_id: str = None):
+        if len(self.requests) >= self.MAX_REQUESTS:
+            raise ValueError('배치 요청은 1000개까지만 묶을 수 있습니다.')
+        self.requests.append((request_id or str(len(self.requests)), request, callback))
+
+    def execute(self, http=None):
+        self.api.round_trip()
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = request._run(), None
+            except HttpError as e:
+                response, exception = None, e
+            (callback or self.callback)(request_id, response, exception)
+
+class FakeTasksResource:
+    def __init__(self, api: 'FakeTasksApi'):
+        self.api = api
+
+    def list(self, tasklist: str, maxResults: int = 20, pageToken: str = None,
+             showCompleted: bool = True, showHidden: bool = False, showDeleted: bool = False,
+             updatedMin: str = None, completedMin: str = None, fields: str = None, **kwargs) -> FakeRequest:
+        def handler():
+            tasks = list(self.api.store.values())
+            if not showDeleted:
+                tasks = [task for task in tasks if not task.get('deleted')]
+            if not showCompleted:
+                tasks = [task for task in tasks if task['status'] != 'completed']
+            if not showHidden:
+                tasks = [task for task in tasks if not task.get('hidden')]
+            if updatedMin:
+                since = _parse(updatedMin)
+                tasks = [task for task in tasks if _parse(task['updated']) >= since]
+            if completedMin:
+                since = _parse(completedMin)
+                tasks = [task for task in tasks if task.get('completed') and _parse(task['completed']) >= since]
+
+            size = min(maxResults or 20, 100)
+            start = int(pageToken) if pageToken else 0
+            response = {'kind': 'tasks#tasks', 'etag': f'"{len(self.api.store)}"',
+                        'items': tasks[start:start + size]}
+            if start + size < len(tasks):
+                response['nextPageToken'] = str(start + size)
+            return self.api.project(response, fields)
+        return FakeRequest(self.api, 'tasks.tasks.list', handler)
+
+    def get(self, tasklist: str, task: str, fields: str = None) -> FakeRequest:
+        def handler():
+            found = self.api.store.get(task)
+            if found is None or found.get('deleted'):
+                raise self.api.not_found_error()
+            return self.api.project_item(found, fields)
+        return FakeRequest(self.api, 'tasks.tasks.get', handler)
+
+    def insert(self, tasklist: str, body: Dict, **kwargs) -> FakeRequest:
+        def handler():
+            task = make_google_task(body.get('title', ''), body.get('notes', ''))
+            self.api.store_task({**task, **body, 'id': task['id'], 'etag': task['etag']})
+            return self.api.store[task['id']]
+        return FakeRequest(self.api, 'tasks.tasks.insert', handler)
+
+    def patch(self, tasklist: str, task: str, body: Dict, **kwargs) -> FakeRequest:
+        def handler():
+            found = self.api.store.get(task)
+            if found is None or found.get('deleted'):
+                raise self.api.not_found_error()
+            return self.api.store_task({**found, **body})
+        return FakeRequest(self.api, 'tasks.tasks.patch', handler)
+
+    def update(self, tasklist: str, task: str, body: Dict, **kwargs) -> FakeRequest:
+        def handler():
+            found = self.api.store.get(task)
+            if found is None or found.get('deleted'):
+                raise self.api.not_found_error()
+            return self.api.store_task({'kind': 'tasks#task', **body, 'id': task})
+        return FakeRequest(self.api, 'tasks.tasks.update', handler)
+
+    def delete(self, tasklist: str, task: str) -> FakeRequest:
+        def handler():
+            found = self.api.store.get(task)
+            if found is None:
+                raise self.api.not_found_error()
+            self.api.store_task({**found, 'deleted': True, 'hidden': True})
+            return ''
+        return FakeRequest(self.api, 'tasks.tasks.delete', handler)
+
+class FakeTasklistsResource:
+    def __init__(self, api: 'FakeTasksApi'):
+        self.api = api
+
+    def list(self, **kwargs) -> FakeRequest:
+        return FakeRequest(self.api, 'tasks.tasklists.list', lambda: {
+            'kind': 'tasks#taskLists',
+            'items': [{'kind': 'tasks#taskList', 'id': self.api.tasklist_id, 'title': '습관'}]
+        })
+
+class FakeTasksApi(SimulatedApi):
+    """googleapiclient Tasks 서비스 객체 대역 (작업 목록 하나)"""
+
+    def __init__(self, tasklist_id: str = 'benchmark', **kwargs):
+        super().__init__(**kwargs)
+        self.tasklist_id = tasklist_id
+        self.store: Dict[str, Dict] = {}
+
+    def tasks(self) -> FakeTasksResource:
+        return FakeTasksResource(self)
+
+    def tasklists(self) -> FakeTasklistsResource:
+        return FakeTasklistsResource(self)
+
+    def new_batch_http_request(self, callback=None) -> FakeBatch:
+        return FakeBatch(self, callback)
+
+    def add_task(self, task: Dict) -> Dict:
+        self.store[task['id']] = task
+        return task
+
+    def store_task(self, task: Dict) -> Dict:
+        """쓰기 결과 저장 (etag/updated 갱신, 완료 상태와 completed 시각 맞춤)"""
+        now = _format(_now())
+        task = {key: value for key, value in task.items() if value is not None}
+        if task.get('status') == 'completed':
+            task.setdefault('completed', now)
+        else:
+            task.pop('completed', None)
+        task['updated'] = now
+        task['etag'] = f'"{uuid.uuid4().hex[:16]}"'
+        with self._lock:
+            # 수정된 작업은 목록의 뒤로 보내 updated 순서를 유지합니다.
+            self.store.pop(task['id'], None)
+            self.store[task['id']] = task
+        return task
+
+    def rate_limit_error(self) -> HttpError:
+        resp = httplib2.Response({'status': 429, 'retry-after': str(self.retry_after)})
+        content = json.dumps({'error': {'code': 429, 'message': 'Rate Limit Exceeded', 'errors': [
+            {'reason': 'rateLimitExceeded', 'domain': 'usageLimits', 'message': 'Rate Limit Exceeded'}
+        ]}}).encode()
+        return HttpError(resp, content, uri='https://tasks.googleapis.com/tasks/v1')
+
+    def not_found_error(self) -> HttpError:
+        resp = httplib2.Response({'status': 404})
+        content = json.dumps({'error': {'code': 404, 'message': 'Not Found'}}).encode()
+        return HttpError(resp, content, uri='https://tasks.googleapis.com/tasks/v1')
+
+    def project_item(self, task: Dict, fields: Optional[str]) -> Dict:
+        if not fields:
+            return task
+        wanted = set(fields.split(','))
+        return {key: value for key, value in task.items() if key in wanted}
+
+    def project(self, response: Dict, fields: Optional[str]) -> Dict:
+        """fields 부분 응답 요청을 적용"""
+        if not fields:
+            return response
+        parsed = _parse_fields(fields)
+        projected = {}
+        for name, inner in parsed.items():
+            if name not in response:
+                continue
+            if name == 'items' and inner:
+                projected[name] = [{key: value for key, value in task.items() if key in inner}
+                                   for task in response[name]]
+            else:
+                projected[name] = response[name]
+        return projected
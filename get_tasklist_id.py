@@ -1,33 +1,10 @@
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-import os.path
-import pickle
 
-# If modifying these scopes, delete the file token.pickle.
-SCOPES = ['https://www.googleapis.com/auth/tasks.readonly']
+from token_manager import get_token_manager
 
 def get_credentials():
-    creds = None
-    # The file token.pickle stores the user's access and refresh tokens
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-    
-    # If there are no (valid) credentials available, let the user log in.
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        # Save the credentials for the next run
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-
-    return creds
+    # 동기화와 같은 token.json과 스코프를 씁니다. 토큰이 없으면 브라우저로 인증합니다.
+    return get_token_manager('token.json').credentials(interactive=True)
 
 def main():
     creds = get_credentials()
@@ -47,4 +24,4 @@ def main():
             print('-------------------')
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main() 
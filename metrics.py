@@ -0,0 +1,209 @@
+import os
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from retry import classify
+
+# 단계 이름과 보고서에 표시할 이름
+PHASE_LABELS = {
+    'list': '목록',
+    'validate': '검증',
+    'create': '추가',
+    'completion': '완료 확인',
+}
+
+# 보고서에 표시할 처리 항목 이름
+ITEM_LABELS = {
+    'tasks_created': '추가',
+    'tasks_resumed': '이어서 기록',
+    'tasks_completed': '완료 반영',
+    'tasks_reset': '업로드 초기화',
+    'links_repaired': '연결 복구',
+    'google_updated': 'Google 변경 반영',
+    'notion_updated': 'Notion 변경 반영',
+}
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """정렬된 값의 nearest-rank 백분위수"""
+    if not values:
+        return None
+    rank = max(math.ceil(p / 100 * len(values)), 1)
+    return values[rank - 1]
+
+class SyncMetrics:
+    """한 번의 동기화 실행에서 모으는 단계별 시간, API 호출, 처리 항목 통계
+
+    Google 요청, Notion 조회, 비동기 Notion 기록 작업자가 모두 같은 객체에
+    기록합니다. 데몬 모드에서는 sync_tasks()가 시작할 때 reset()으로 비웁니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.monotonic()
+            self.finished: Optional[float] = None
+            self.phases: Dict[str, float] = {}
+            self.latencies: Dict[str, List[float]] = {}
+            self.failures: Dict[str, int] = {}
+            self.rate_limited: Dict[str, int] = {}
+            self.items: Dict[str, int] = {}
+
+    def merge(self, other: 'SyncMetrics'):
+        """다른 실행(동기화 쌍)의 통계를 더함 (단계 시간은 쌍별 시간의 합)"""
+        with self._lock:
+            for name, seconds in other.phases.items():
+                self.phases[name] = self.phases.get(name, 0.0) + seconds
+            for endpoint, values in other.latencies.items():
+                self.latencies.setdefault(endpoint, []).extend(values)
+            for target, source in ((self.failures, other.failures), (self.rate_limited, other.rate_limited),
+                                   (self.items, other.items)):
+                for key, value in source.items():
+                    target[key] = target.get(key, 0) + value
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @contextmanager
+    def phase(self, name: str):
+        """with 블록의 실행 시간을 단계 시간에 더함"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def count(self, name: str, n: int = 1):
+        if n:
+            with self._lock:
+                self.items[name] = self.items.get(name, 0) + n
+
+    def record_call(self, endpoint: str, seconds: float, error: Exception = None):
+        """API 호출 한 번(재시도는 각각 한 번)의 지연 시간과 결과 기록"""
+        retryable = classify(error) if error is not None else None
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(seconds)
+            if error is not None:
+                self.failures[endpoint] = self.failures.get(endpoint, 0) + 1
+            if retryable is not None and retryable.rate_limited:
+                self.rate_limited[endpoint] = self.rate_limited.get(endpoint, 0) + 1
+
+    def timed(self, endpoint: str, fn: Callable) -> Callable:
+        """fn을 호출할 때마다 지연 시간을 기록하는 함수로 감쌈"""
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self.record_call(endpoint, time.perf_counter() - started, e)
+                raise
+            self.record_call(endpoint, time.perf_counter() - started)
+            return result
+        return call
+
+    @property
+    def api_calls(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    def endpoint_stats(self) -> Dict[str, Dict]:
+        stats = {}
+        with self._lock:
+            latencies = {endpoint: sorted(values) for endpoint, values in self.latencies.items()}
+        for endpoint, values in sorted(latencies.items()):
+            stats[endpoint] = {
+                'calls': len(values),
+                'failures': self.failures.get(endpoint, 0),
+                'rate_limited': self.rate_limited.get(endpoint, 0),
+                'total_seconds': sum(values),
+                'p50_ms': percentile(values, 50) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+            }
+        return stats
+
+    def to_dict(self) -> Dict:
+        return {
+            'duration_seconds': self.duration,
+            'phases': dict(self.phases),
+            'api_calls': self.api_calls,
+            'rate_limited': sum(self.rate_limited.values()),
+            'endpoints': self.endpoint_stats(),
+            'items': dict(self.items),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix: str = 'notion_google_sync') -> str:
+        """Prometheus 텍스트 형식 (node_exporter textfile collector용)"""
+        lines = [
+            f"# TYPE {prefix}_duration_seconds gauge",
+            f"{prefix}_duration_seconds {self.duration:.6f}",
+            f"# TYPE {prefix}_phase_seconds gauge",
+        ]
+        lines += [f'{prefix}_phase_seconds{{phase="{name}"}} {seconds:.6f}'
+                  for name, seconds in self.phases.items()]
+
+        stats = self.endpoint_stats()
+        lines.append(f"# TYPE {prefix}_api_latency_seconds summary")
+        for endpoint, stat in stats.items():
+            for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+                lines.append(f'{prefix}_api_latency_seconds{{endpoint="{endpoint}",quantile="{quantile}"}} '
+                             f'{stat[key] / 1000:.6f}')
+            lines.append(f'{prefix}_api_latency_seconds_sum{{endpoint="{endpoint}"}} {stat["total_seconds"]:.6f}')
+            lines.append(f'{prefix}_api_latency_seconds_count{{endpoint="{endpoint}"}} {stat["calls"]}')
+        for name, key in (('api_failures_total', 'failures'), ('rate_limited_total', 'rate_limited')):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines += [f'{prefix}_{name}{{endpoint="{endpoint}"}} {stat[key]}'
+                      for endpoint, stat in stats.items()]
+
+        lines.append(f"# TYPE {prefix}_items_total counter")
+        lines += [f'{prefix}_items_total{{kind="{name}"}} {value}' for name, value in self.items.items()]
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path: str):
+        """확장자가 .prom이면 Prometheus, 아니면 JSON 형식으로 저장"""
+        content = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        # textfile collector가 반쯤 쓰인 파일을 읽지 않도록 임시 파일을 거쳐 교체합니다.
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def summary(self, top: int = 5) -> str:
+        """텔레그램 보고서에 붙일 요약 (HTML)"""
+        lines = []
+        if self.phases:
+            phases = ' · '.join(f"{PHASE_LABELS.get(name, name)} {seconds:.1f}초"
+                                for name, seconds in self.phases.items())
+            lines.append(f"⏳ 단계별 시간: {phases}")
+
+        items = [f"{label} {self.items[name]}" for name, label in ITEM_LABELS.items()
+                 if self.items.get(name)]
+        if items:
+            lines.append(f"📦 처리 항목: {', '.join(items)}")
+
+        stats = self.endpoint_stats()
+        if stats:
+            rate_limited = sum(stat['rate_limited'] for stat in stats.values())
+            line = f"🌐 API 호출 {self.api_calls}회"
+            if rate_limited:
+                line += f" (요청 한도 초과 {rate_limited}회)"
+            lines.append(line)
+            busiest = sorted(stats.items(), key=lambda item: item[1]['calls'], reverse=True)[:top]
+            for endpoint, stat in busiest:
+                lines.append(f"  • {endpoint}: {stat['calls']}회, "
+                             f"p50 {stat['p50_ms']:.0f}ms, p95 {stat['p95_ms']:.0f}ms")
+        return '\n'.join(lines)
@@ -0,0 +1,166 @@
+import os
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from transport import SharedTransport, get_transport
+
+logger = logging.getLogger(__name__)
+
+# 이 시간(초) 동안 들어온 메시지를 모아 한 번에 보냄
+NOTIFY_DELAY = float(os.environ.get('TELEGRAM_NOTIFY_DELAY', 2))
+
+# 텔레그램 요청 하나를 기다리는 최대 시간(초)
+NOTIFY_TIMEOUT = float(os.environ.get('TELEGRAM_NOTIFY_TIMEOUT', 10))
+
+# 텔레그램 메시지 하나의 최대 길이
+MAX_MESSAGE_LENGTH = 4096
+
+def _cut_point(text: str, limit: int) -> int:
+    """limit 안에서 HTML 태그나 엔티티(&amp; 등)를 자르지 않는 위치"""
+    head = text[:limit]
+    cut = limit
+    if head.rfind('<') > head.rfind('>'):
+        cut = head.rfind('<')
+    if head.rfind('&', 0, cut) > head.rfind(';', 0, cut):
+        cut = head.rfind('&', 0, cut)
+    # 태그 하나가 limit보다 긴 경우에만 그대로 자릅니다.
+    return cut or limit
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """limit보다 긴 메시지를 줄 단위로 나눔
+
+    보고서의 태그(<b>…</b>)는 한 줄 안에서 열고 닫으므로 줄 경계에서 나누면 각 부분의
+    HTML이 그대로 유효합니다. 한 줄이 limit보다 길면 태그와 엔티티를 피해 자릅니다.
+    """
+    parts = []
+    current = ''
+    for line in text.split('\n'):
+        while len(line) > limit:
+            cut = _cut_point(line, limit)
+            if current:
+                parts.append(current)
+                current = ''
+            parts.append(line[:cut])
+            line = line[cut:]
+        if current and len(current) + 1 + len(line) > limit:
+            parts.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        parts.append(current)
+    return parts
+
+def coalesce(messages: List[str], limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """모인 메시지를 보낼 메시지 목록으로 합침
+
+    같은 메시지는 한 번만 남기고 횟수를 붙이며, 서로 다른 메시지는 길이 제한 안에서
+    하나의 메시지로 묶습니다. 길이 제한보다 긴 메시지는 split_message()로 나눠 보냅니다.
+    """
+    counts: Dict[str, int] = {}
+    for message in messages:
+        counts[message] = counts.get(message, 0) + 1
+
+    digests = []
+    current = ''
+    for message, count in counts.items():
+        item = message if count == 1 else f"{message}\n(×{count})"
+        for part in split_message(item, limit):
+            if current and len(current) + 2 + len(part) > limit:
+                digests.append(current)
+                current = part
+            else:
+                current = f"{current}\n\n{part}" if current else part
+    if current:
+        digests.append(current)
+    return digests
+
+class TelegramNotifier:
+    """텔레그램 메시지를 모아 백그라운드에서 보내는 알림 큐
+
+    notify()는 메시지를 큐에 넣고 바로 반환합니다. delay초 동안 들어온 메시지는
+    coalesce()로 합쳐 SharedTransport의 이벤트 루프에서 하나의 Bot으로 보내고,
+    요청마다 timeout을 적용하므로 텔레그램이 응답하지 않아도 동기화가 멈추거나
+    실패하지 않습니다. 실행을 마칠 때 flush()로 남은 메시지를 보냅니다.
+    """
+
+    def __init__(self, token: Optional[str], chat_id: Optional[str],
+                 transport: Optional[SharedTransport] = None,
+                 delay: float = NOTIFY_DELAY, timeout: float = NOTIFY_TIMEOUT):
+        self.token = token
+        self.chat_id = chat_id
+        self._transport = transport
+        self.delay = delay
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self._pending: List[str] = []
+        self._scheduled = False
+        self._future: Optional[concurrent.futures.Future] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+
+    @property
+    def transport(self) -> SharedTransport:
+        return self._transport or get_transport()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token and self.chat_id)
+
+    def notify(self, message: str):
+        """메시지를 큐에 넣고 바로 반환 (delay초 뒤에 모아서 전송)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.append(message)
+            if not self._scheduled:
+                self._scheduled = True
+                self._future = self.transport.submit(self._flush_later())
+
+    async def _flush_later(self):
+        # 이벤트는 공유 이벤트 루프 안에서 만들어야 합니다.
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._wake.wait(), self.delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+        await self._send_pending()
+
+    async def _send_pending(self):
+        with self._lock:
+            messages, self._pending = self._pending, []
+            # 이후에 들어오는 메시지는 새로 예약합니다.
+            self._scheduled = False
+        for text in coalesce(messages):
+            try:
+                bot = await asyncio.wait_for(self.transport.telegram_bot(self.token), self.timeout)
+                await asyncio.wait_for(
+                    bot.send_message(chat_id=self.chat_id, text=text, parse_mode='HTML'), self.timeout
+                )
+                self.sent += 1
+                logger.info("텔레그램 메시지 전송 성공")
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"텔레그램 메시지 전송 실패: {str(e) or type(e).__name__}")
+
+    async def _wake_up(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def flush(self, timeout: Optional[float] = None):
+        """기다리는 메시지를 바로 보내고 끝날 때까지 기다림 (실패해도 예외를 내지 않음)"""
+        future = self._future
+        if future is None or future.done():
+            return
+        timeout = timeout or self.timeout * 2
+        try:
+            self.transport.run(self._wake_up(), timeout)
+            future.result(timeout)
+        except Exception as e:
+            logger.error(f"텔레그램 알림을 모두 보내지 못했습니다: {str(e) or type(e).__name__}")
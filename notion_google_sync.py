@@ -1,26 +1,40 @@
 import os
+import sys
+import html
 import logging
+import contextlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Set
-from notion_client import Client
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from googleapiclient.errors import HttpError
 import json
-import asyncio
-import telegram
-from telegram.ext import Updater
+import argparse
+import itertools
+from sync_state import SYNC_STATE_DIR, WATERMARK_MARGIN, IdMapStore, SyncState, format_timestamp, utc_now
+from metrics import SyncMetrics
+from notion_writer import AsyncNotionWriter
+from transport import get_transport
+from notifier import TelegramNotifier
+from token_manager import TokenError, get_token_manager, stop_token_managers
+from retry import RetryPolicy, classify, was_rejected
+from sync_pairs import MultiPairSync, SyncPair, load_pairs
+from sync_daemon import (DEFAULT_WEBHOOK_HOST, MAX_POLL_INTERVAL, MIN_POLL_INTERVAL,
+                         NOTION_WEBHOOK_SECRET, is_loopback, run_daemon)
+from sync_diff import diff_records, google_patch_body, notion_properties
+from records import GOOGLE_ID_MARKER, GoogleTask, NotionTask
+from sync_plan import SyncPlan
+
+# notion_client, googleapiclient.discovery, google_auth_oauthlib, telegram 등 무거운 모듈은
+# 처음 필요할 때 함수 안에서 import합니다 (할 일이 없는 실행의 시작 시간을 줄이기 위함).
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # GitHub Actions 시크릿 또는 환경 변수에서 값 가져오기
-NOTION_TOKEN = os.environ['NOTION_TOKEN']
-NOTION_DATABASE_ID = os.environ['NOTION_DATABASE_ID']
-GOOGLE_TASKLIST_ID = os.environ['GOOGLE_TASKLIST_ID']
+# (--pairs 설정 파일을 쓰면 쌍마다 따로 지정하므로 없어도 됩니다)
+NOTION_TOKEN = os.environ.get('NOTION_TOKEN')
+NOTION_DATABASE_ID = os.environ.get('NOTION_DATABASE_ID')
+GOOGLE_TASKLIST_ID = os.environ.get('GOOGLE_TASKLIST_ID')
 TELEGRAM_BOT_TOKEN = os.environ['TELEGRAM_BOT_TOKEN']
 TELEGRAM_CHAT_ID = os.environ['TELEGRAM_CHAT_ID']
 
@@ -28,8 +42,26 @@ TELEGRAM_CHAT_ID = os.environ['TELEGRAM_CHAT_ID']
 GOOGLE_APPLICATION_CREDENTIALS = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
 GOOGLE_CREDENTIALS = os.environ.get('GOOGLE_CREDENTIALS')
 GOOGLE_REFRESH_TOKEN = os.environ.get('GOOGLE_REFRESH_TOKEN')
+
+# 여러 데이터베이스/작업 목록 쌍을 동기화할 때의 설정 파일 (--pairs와 같음)
+SYNC_PAIRS_FILE = os.environ.get('SYNC_PAIRS_FILE')
 GOOGLE_TOKEN = os.environ.get('GOOGLE_TOKEN')
 
+# 한 번의 배치 HTTP 요청에 묶을 Google Tasks 요청 수
+GOOGLE_BATCH_SIZE = 50
+
+# 동기화에서 읽는 Notion 속성 (조회 응답에는 이 속성만 받습니다)
+NOTION_SYNC_PROPERTIES = ('이름', '날짜', 'remark', '완료여부', 'google 업로드')
+
+# Notion 조회 한 번에 or로 묶을 조건 수
+NOTION_OR_FILTER_SIZE = 50
+
+# Google Tasks에 업로드된 Notion 작업
+UPLOADED_FILTER = {"property": "google 업로드", "select": {"equals": "완료"}}
+
+# --plan 실행에서 아직 만들지 않은 태스크 리스트 대신 쓰는 ID
+PLANNED_TASKLIST_ID = '(planned)'
+
 # credentials.json 파일 생성 (GitHub Actions 환경에서)
 def setup_google_credentials():
     """GitHub Actions 환경에서 Google 인증 정보 설정"""
@@ -43,117 +75,312 @@ def setup_google_credentials():
             f.write(GOOGLE_TOKEN)
         logger.info("token.json 파일이 생성되었습니다.")
 
-async def send_telegram_message(message):
-    """텔레그램으로 메시지를 비동기적으로 전송합니다."""
-    try:
-        if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
-            async with telegram.Bot(token=TELEGRAM_BOT_TOKEN) as bot:
-                await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message, parse_mode='HTML')
-                logger.info("텔레그램 메시지 전송 성공")
-    except Exception as e:
-        logger.error(f"텔레그램 메시지 전송 실패: {str(e)}")
+# 실행 중 알림을 모아 백그라운드에서 보내는 텔레그램 큐
+notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
 
-def get_google_credentials():
-    """Google OAuth 인증 정보를 가져옵니다."""
-    creds = None
-    if os.path.exists('token.json'):
-        try:
-            creds = Credentials.from_authorized_user_file('token.json', ['https://www.googleapis.com/auth/tasks'])
-        except Exception as e:
-            logger.error(f"토큰 파일 로드 중 오류 발생: {str(e)}")
-            return None
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                logger.info("토큰이 만료되어 갱신을 시도합니다.")
-                creds.refresh(Request())
-                # 갱신된 토큰 저장
-                with open('token.json', 'w') as token:
-                    token.write(creds.to_json())
-                logger.info("토큰이 성공적으로 갱신되었습니다.")
-                asyncio.run(send_telegram_message("🔄 <b>Google 토큰이 자동으로 갱신되었습니다.</b>"))
-            except Exception as e:
-                logger.error(f"토큰 갱신 중 오류 발생: {str(e)}")
-                asyncio.run(send_telegram_message(f"⚠️ <b>토큰 갱신 실패</b>\n\n{str(e)}"))
-                return None
-        else:
-            try:
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', ['https://www.googleapis.com/auth/tasks'])
-                creds = flow.run_local_server(port=0)
-                with open('token.json', 'w') as token:
-                    token.write(creds.to_json())
-                logger.info("새로운 토큰이 생성되었습니다.")
-                asyncio.run(send_telegram_message("✨ <b>새로운 Google 토큰이 생성되었습니다.</b>"))
-            except Exception as e:
-                logger.error(f"새 토큰 생성 중 오류 발생: {str(e)}")
-                asyncio.run(send_telegram_message(f"⚠️ <b>새 토큰 생성 실패</b>\n\n{str(e)}"))
-                return None
-    
+def notify(message):
+    """텔레그램 메시지를 큐에 넣고 바로 반환 (잠시 모았다가 합쳐서 전송)"""
+    notifier.notify(message)
+
+def get_google_credentials(token_file: str = 'token.json'):
+    """Google OAuth 인증 정보를 가져옵니다.
+
+    같은 토큰 파일을 쓰는 모든 클라이언트가 하나의 TokenManager를 공유하고,
+    액세스 토큰은 만료 전에 백그라운드에서 갱신되어 파일에 저장됩니다.
+    """
+    manager = get_token_manager(
+        token_file, on_error=lambda e: notify(f"⚠️ <b>토큰 갱신 실패</b>\n\n{html.escape(str(e))}")
+    )
+    try:
+        # 쓸 수 있는 토큰이 없으면 브라우저 인증으로 새로 만듭니다.
+        manager.credentials(interactive=True)
+        creds = manager.google_credentials()
+    except TokenError as e:
+        logger.error(str(e))
+        notify(f"⚠️ <b>Google 인증 실패</b>\n\n{html.escape(str(e))}")
+        return None
+    manager.start()
     return creds
 
+class GoogleTasksSnapshot:
+    """한 번의 동기화 실행 동안 공유하는 Google Tasks 목록 스냅샷
+
+    목록을 한 번만 가져와 작업 ID, notes에 기록된 Notion ID, 내용 키(content_key)
+    기준으로 색인해 두고, 각 단계가 Google Tasks에 쓴 결과는 add()로 다시 반영합니다.
+    작업은 응답 dict가 아니라 필요한 값만 담은 GoogleTask로 보관합니다.
+    """
+
+    # 스냅샷에 필요한 필드만 요청합니다.
+    FIELDS = 'id,etag,title,notes,status,completed,due,updated,deleted'
+
+    def __init__(self, tasks: Iterable[GoogleTask] = (), complete: bool = True):
+        # updatedMin으로 일부만 가져온 스냅샷이면 complete=False
+        self.complete = complete
+        self.by_id: Dict[str, GoogleTask] = {}
+        # 부분 스냅샷에서 삭제된 것으로 확인된 작업 ID
+        self.deleted_ids: Set[str] = set()
+        self.by_notion_id: Dict[str, str] = {}
+        self.by_key: Dict[str, str] = {}
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[GoogleTask]:
+        return iter(list(self.by_id.values()))
+
+    def add(self, task: GoogleTask):
+        """작업을 추가하거나 같은 ID의 기존 항목을 교체하고 색인을 갱신"""
+        previous = self.by_id.pop(task.id, None)
+        if previous:
+            self._unindex(previous)
+        if task.deleted:
+            self.deleted_ids.add(task.id)
+            return
+        self.by_id[task.id] = task
+        if task.notion_id:
+            self.by_notion_id[task.notion_id] = task.id
+            self.by_key[task.content_key()] = task.id
+
+    def _unindex(self, task: GoogleTask):
+        if not task.notion_id:
+            return
+        if self.by_notion_id.get(task.notion_id) == task.id:
+            del self.by_notion_id[task.notion_id]
+        key = task.content_key()
+        if self.by_key.get(key) == task.id:
+            del self.by_key[key]
+
+    def get(self, task_id: str) -> Optional[GoogleTask]:
+        return self.by_id.get(task_id)
+
+    def find_by_notion_id(self, notion_id: str) -> Optional[GoogleTask]:
+        task_id = self.by_notion_id.get(notion_id)
+        return self.by_id.get(task_id) if task_id else None
+
+    def find_by_key(self, key: str) -> Optional[GoogleTask]:
+        task_id = self.by_key.get(key)
+        return self.by_id.get(task_id) if task_id else None
+
 class NotionGoogleTasksSync:
-    def __init__(self):
+    def __init__(self, pair: Optional[SyncPair] = None, notion=None, tasks_service=None,
+                 notion_async_client=None, verbose: bool = False, plan: bool = False):
+        """pair가 없으면 환경 변수의 데이터베이스/작업 목록 한 쌍을 동기화합니다.
+
+        클라이언트를 넘기면 환경 변수로 만드는 대신 그 클라이언트를 사용합니다 (벤치마크 등).
+        verbose=True이면 완료 반영 같은 대량 처리에서도 작업별 결과를 출력합니다.
+        plan=True이면 읽기만 하고 쓰기 작업은 self.plan(SyncPlan)에 모읍니다. 연결 색인은
+        메모리 복사본을 쓰고 워터마크도 저장하지 않으므로 다음 실행에 영향이 없습니다.
+        """
+        self.verbose = verbose
+        # 단일 쌍은 이전과 같은 상태 디렉터리를 그대로 씁니다.
+        self.pair = pair or SyncPair('default', NOTION_DATABASE_ID, GOOGLE_TASKLIST_ID,
+                                     notion_token=NOTION_TOKEN, state_dir=SYNC_STATE_DIR)
+        # 모든 API 호출에 적용할 재시도 정책과 이번 실행에서 끝내 실패한 작업 기록
+        self.retry_policy = RetryPolicy()
+        self.errors: List[str] = []
+        # 이번 실행에서 기록에 실패한 Notion 페이지 (같은 실패를 되풀이하지 않기 위함)
+        self.failed_pages: Set[str] = set()
+        # 지금까지 기록한 변경 수 (데몬 모드의 폴링 간격 조절에 사용)
+        self.write_count = 0
+        # 실행별 단계 시간, API 호출 수/지연 시간, 처리 항목 통계
+        self.metrics = SyncMetrics()
+        
         # Notion 클라이언트 초기화
-        self.notion = Client(auth=NOTION_TOKEN)
-        self.database_id = NOTION_DATABASE_ID
+        self.transport = get_transport()
+        if notion is None:
+            from notion_client import Client
+            notion = Client(auth=self.pair.notion_token, client=self.transport.notion_http_client())
+        self.notion = notion
+        self.database_id = self.pair.database_id
+        # filter_properties에 넘길 속성 ID (처음 조회할 때 데이터베이스 스키마에서 찾음)
+        self._property_ids: Optional[List[str]] = None
+        
+        # 페이지별로 모아 두었다가 한 번에 쓰는 Notion 속성 변경과 이를 기록하는 작업자 풀
+        self.pending_notion_updates: Dict[str, Dict] = {}
+        # 변경이 기록되면 연결 색인에 저장할 페이지별 마지막 동기화 상태
+        self.pending_synced_states: Dict[str, Dict] = {}
+        # 요청 한도는 같은 Notion 토큰을 쓰는 모든 쌍이 함께 씁니다 (동기 조회에도 적용).
+        self.notion_writer = AsyncNotionWriter(
+            self.pair.notion_token, retry_policy=self.retry_policy, transport=self.transport, metrics=self.metrics,
+            client_factory=(lambda: notion_async_client) if notion_async_client is not None else None
+        )
+        # --plan 실행에서 보내지 않고 모아 두는 쓰기 작업 (작업 목록을 찾기 전에 만들어야 합니다)
+        self.plan: Optional[SyncPlan] = SyncPlan(GOOGLE_BATCH_SIZE, self.notion_writer.bucket.rate) \
+            if plan else None
         
         # Google Tasks 클라이언트 초기화
-        self.tasks_service = self._initialize_google_tasks()
+        self.tasks_service = tasks_service or self._initialize_google_tasks()
         self.tasklist_id = self._get_default_tasklist_id()
+        
+        # Notion 페이지 ID <-> Google Task ID 연결 색인
+        self.id_map = IdMapStore(self.database_id, self.tasklist_id, self.pair.state_dir, in_memory=plan)
+
+    def _execute(self, request, idempotent: bool = True):
+        """Google API 요청을 재시도 정책에 따라 실행 (시도마다 지연 시간 기록)
+
+        insert처럼 다시 보내면 중복이 생기는 요청은 idempotent=False로 실행해, 서버가
+        거절했음이 확실한 오류일 때만 다시 보냅니다.
+        """
+        # 'tasks.tasks.list' -> 'tasks.list', 배치 요청에는 methodId가 없습니다.
+        method_id = getattr(request, 'methodId', None)
+        endpoint = method_id.split('.', 1)[1] if method_id else 'tasks.batch'
+        return self.retry_policy.call(self.metrics.timed(endpoint, request.execute), idempotent=idempotent)
+
+    def _notion_call(self, method, **kwargs):
+        """Notion 클라이언트 호출을 재시도 정책에 따라 실행 (시도마다 지연 시간 기록)"""
+        # DatabasesEndpoint.query -> 'databases.query'
+        resource = type(method.__self__).__name__.replace('Endpoint', '').lower()
+        timed = self.metrics.timed(f"{resource}.{method.__name__}", method)
+        bucket = self.notion_writer.bucket
+
+        def throttled(**call_kwargs):
+            bucket.wait()
+            try:
+                return timed(**call_kwargs)
+            except Exception as e:
+                # 429이면 같은 토큰을 쓰는 다른 쌍과 기록 작업자도 함께 멈춥니다.
+                retryable = classify(e)
+                if retryable is not None and retryable.rate_limited and retryable.retry_after:
+                    bucket.pause(retryable.retry_after)
+                raise
+        return self.retry_policy.call(throttled, **kwargs)
+
+    def plan_report(self) -> Dict:
+        """--plan으로 실행한 sync_tasks()가 모은 쓰기 작업과 예상 비용"""
+        return {
+            'pair': self.pair.name,
+            'database_id': self.database_id,
+            'tasklist_id': self.tasklist_id,
+            **self.plan.to_dict(self.metrics)
+        }
+
+    def _detail(self, message: str):
+        """verbose일 때만 출력하는 작업별 진행 상황"""
+        if self.verbose:
+            print(message)
+
+    def _record_error(self, message: str):
+        """재시도 후에도 실패한 작업을 기록해 실행 결과 보고에 포함"""
+        print(f"  • {message}")
+        self.errors.append(message)
 
     def _initialize_google_tasks(self) -> any:
         """Google Tasks API 인증 및 서비스 객체 생성"""
-        creds = get_google_credentials()
+        creds = get_google_credentials(self.pair.google_token_file)
         if not creds:
             raise Exception("Google 인증 정보를 가져올 수 없습니다.")
-        return build('tasks', 'v1', credentials=creds)
+        # googleapiclient에 포함된 discovery 문서를 사용하므로 네트워크 요청이 없습니다.
+        # 요청은 공유 연결 계층의 httplib2.Http를 거쳐 keep-alive 연결을 재사용합니다.
+        from googleapiclient.discovery import build
+        from google_auth_httplib2 import AuthorizedHttp
+        http = AuthorizedHttp(creds, http=self.transport.google_http())
+        return build('tasks', 'v1', http=http, static_discovery=True, cache_discovery=False)
 
     def _get_default_tasklist_id(self) -> str:
         """기본 태스크 리스트 ID 가져오기"""
-        # 환경 변수에서 태스크 리스트 ID를 가져오기 시도
-        tasklist_id = GOOGLE_TASKLIST_ID
+        # 설정(환경 변수 또는 동기화 쌍)에서 태스크 리스트 ID를 가져오기 시도
+        tasklist_id = self.pair.tasklist_id
         if tasklist_id:
             return tasklist_id
 
-        # 환경 변수에 없다면 사용자의 태스크 리스트를 가져와서 '습관' 리스트 찾기
+        # 설정에 없다면 사용자의 태스크 리스트를 가져와서 같은 이름의 리스트 찾기
+        title = self.pair.tasklist_title
         try:
-            results = self.tasks_service.tasklists().list().execute()
+            results = self._execute(self.tasks_service.tasklists().list())
             tasklists = results.get('items', [])
 
             if not tasklists:
                 print("태스크 리스트를 찾을 수 없습니다. 새로운 리스트를 생성합니다.")
-                new_list = self.tasks_service.tasklists().insert(body={
-                    'title': '습관'
-                }).execute()
-                return new_list['id']
+                return self._create_tasklist(title)
             
             # 모든 태스크 리스트 출력
             print("\n사용 가능한 태스크 리스트:")
             for i, tasklist in enumerate(tasklists, 1):
                 print(f"{i}. {tasklist['title']} (ID: {tasklist['id']})")
             
-            # '습관' 리스트 찾기
-            habit_list = next((tasklist for tasklist in tasklists if tasklist['title'] == '습관'), None)
+            # 설정한 이름의 리스트 찾기
+            habit_list = next((tasklist for tasklist in tasklists if tasklist['title'] == title), None)
             
             if habit_list:
-                print(f"\n'습관' 태스크 리스트를 사용합니다.")
+                print(f"\n'{title}' 태스크 리스트를 사용합니다.")
                 return habit_list['id']
             else:
-                print("\n'습관' 태스크 리스트를 찾을 수 없어 새로 생성합니다.")
-                new_list = self.tasks_service.tasklists().insert(body={
-                    'title': '습관'
-                }).execute()
-                return new_list['id']
+                print(f"\n'{title}' 태스크 리스트를 찾을 수 없어 새로 생성합니다.")
+                return self._create_tasklist(title)
             
         except Exception as e:
             print(f"태스크 리스트를 가져오는 중 오류 발생: {e}")
             raise
 
-    def get_notion_tasks(self) -> List[Dict]:
-        """Notion 데이터베이스에서 작업 목록 가져오기"""
-        response = self.notion.databases.query(
-            database_id=self.database_id,
+    def _create_tasklist(self, title: str) -> str:
+        """태스크 리스트를 만들고 ID 반환 (계획 실행이면 만들지 않고 임시 ID 반환)"""
+        if self.plan is not None:
+            self.plan.create_tasklist(title)
+            return PLANNED_TASKLIST_ID
+        new_list = self._execute(self.tasks_service.tasklists().insert(body={
+            'title': title
+        }))
+        return new_list['id']
+
+    def _notion_property_ids(self) -> Optional[List[str]]:
+        """동기화에서 읽는 속성의 ID 목록 (databases.retrieve로 한 번만 조회)
+
+        filter_properties에는 속성 이름 대신 ID를 넘겨야 합니다. 스키마를 가져오지
+        못하면 None을 반환해 이전처럼 모든 속성을 받습니다.
+        """
+        if self._property_ids is None:
+            try:
+                database = self._notion_call(self.notion.databases.retrieve, database_id=self.database_id)
+                properties = database.get('properties', {})
+                self._property_ids = [properties[name]['id'] for name in NOTION_SYNC_PROPERTIES
+                                      if name in properties]
+            except Exception as e:
+                logger.warning(f"Notion 데이터베이스 속성을 가져오지 못해 모든 속성을 조회합니다: {str(e)}")
+                self._property_ids = []
+        return self._property_ids or None
+
+    def _projection(self) -> Dict:
+        property_ids = self._notion_property_ids()
+        return {'filter_properties': property_ids} if property_ids else {}
+
+    def _retrieve_notion_page(self, page_id: str) -> NotionTask:
+        """Notion 페이지 하나를 동기화에 쓰는 속성만 담아 조회"""
+        return NotionTask.from_page(
+            self._notion_call(self.notion.pages.retrieve, page_id=page_id, **self._projection())
+        )
+
+    def _iter_notion_tasks(self, **query) -> Iterator[NotionTask]:
+        """Notion 데이터베이스 쿼리 결과를 페이지 단위로 따라가며 하나씩 반환
+
+        next_cursor/has_more를 따라가므로 100개를 넘는 데이터베이스도 모두 읽고,
+        한 번에 한 페이지(최대 100개)만 메모리에 유지합니다. 응답에는 동기화에서
+        읽는 속성만 담기며, 각 페이지는 받자마자 NotionTask로 바꿉니다.
+        """
+        query.update(self._projection())
+        cursor = None
+        while True:
+            if cursor:
+                query['start_cursor'] = cursor
+            response = self._notion_call(
+                self.notion.databases.query,
+                database_id=self.database_id,
+                page_size=100,
+                **query
+            )
+            for page in response['results']:
+                yield NotionTask.from_page(page)
+
+            if not response.get('has_more'):
+                break
+            cursor = response.get('next_cursor')
+            if not cursor:
+                break
+
+    def get_notion_tasks(self) -> Iterator[NotionTask]:
+        """Notion 데이터베이스에서 동기화되지 않은 작업 목록 가져오기"""
+        return self._iter_notion_tasks(
             filter={
                 "and": [
                     {
@@ -165,283 +392,767 @@ class NotionGoogleTasksSync:
                 ]
             }
         )
-        return response['results']
-
-    def create_google_task(self, notion_task: Dict) -> str:
-        """Notion 작업을 Google Tasks에 추가"""
-        # 이름 필드에서 제목 가져오기
-        title = notion_task['properties']['이름']['title']
-        task = {
-            'title': title[0]['text']['content'] if title else '제목 없음',
-            'notes': f"Notion Task ID: {notion_task['id']}",  # Notion ID를 명확한 형식으로 저장
-            'status': 'needsAction'
-        }
-        
-        # 날짜 필드에서 마감일 가져오기
-        if notion_task['properties'].get('날짜') and \
-           notion_task['properties']['날짜']['date']:
-            due_date = notion_task['properties']['날짜']['date']['start']
-            task['due'] = f"{due_date}T00:00:00.000Z"
 
-        result = self.tasks_service.tasks().insert(
-            tasklist=self.tasklist_id,
-            body=task
-        ).execute()
+    def _link_created_task(self, notion_task: NotionTask, result: GoogleTask,
+                           snapshot: Optional[GoogleTasksSnapshot] = None):
+        """새로 만든 Google Task를 스냅샷/연결 색인에 반영하고 Notion remark 쓰기 예약"""
+        if snapshot is not None:
+            snapshot.add(result)
+        self.id_map.record(notion_task.id, result.id, result.etag, result.updated)
 
         # Google Task ID를 Notion의 remark 필드에 저장
-        self.notion.pages.update(
-            page_id=notion_task['id'],
-            properties={
-                "remark": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": f"Google Task ID: {result['id']}"
-                            }
+        # (방금 만든 작업의 값이 양쪽 비교의 기준이 됩니다)
+        self.queue_notion_update(notion_task.id, self._remark_property(result.id),
+                                 synced_state=result.record())
+
+    @staticmethod
+    def _remark_property(google_task_id: str) -> Dict:
+        return {
+            "remark": {
+                "rich_text": [
+                    {
+                        "text": {
+                            "content": f"{GOOGLE_ID_MARKER} {google_task_id}"
                         }
-                    ]
-                }
+                    }
+                ]
             }
-        )
-        
-        return result['id']
+        }
+
+    def queue_notion_update(self, page_id: str, properties: Dict, synced_state: Dict = None):
+        """Notion 페이지 속성 변경을 예약 (같은 페이지의 변경은 하나로 합쳐짐)
+
+        synced_state를 주면 기록에 성공한 뒤 그 값을 마지막 동기화 상태로 저장합니다.
+        """
+        self.pending_notion_updates.setdefault(page_id, {}).update(properties)
+        if synced_state is not None:
+            self.pending_synced_states[page_id] = synced_state
+
+    def flush_notion_updates(self) -> Dict[str, Exception]:
+        """예약된 변경을 페이지당 한 번의 pages.update로 기록
+
+        한 페이지의 모든 속성이 하나의 요청에 담기므로 remark 없이 동기화 상태만
+        '완료'로 바뀌는 일이 없습니다. 요청은 AsyncNotionWriter가 Notion 요청 한도에
+        맞춰 동시에 보내며, 실패한 페이지의 {페이지 ID: 예외}를 반환합니다.
+        """
+        pending, self.pending_notion_updates = self.pending_notion_updates, {}
+        synced_states, self.pending_synced_states = self.pending_synced_states, {}
+        if self.plan is not None:
+            # 계획 실행은 모든 기록이 성공한 것으로 보고 이후 단계를 계속 확인합니다.
+            for page_id, properties in pending.items():
+                self.plan.update_notion(page_id, properties)
+            for page_id, synced_state in synced_states.items():
+                self.id_map.save_synced_state(page_id, synced_state)
+            return {}
+        failures = self.notion_writer.write(pending)
+        self.failed_pages.update(failures)
+        for page_id, e in failures.items():
+            self._record_error(f"Notion 페이지 {page_id} 업데이트 실패: {str(e)}")
+        for page_id, synced_state in synced_states.items():
+            if page_id not in failures:
+                self.id_map.save_synced_state(page_id, synced_state)
+        self.write_count += len(pending) - len(failures)
+        return failures
+
+    def create_google_tasks(self, notion_tasks: List[NotionTask],
+                            snapshot: Optional[GoogleTasksSnapshot] = None) -> Dict[str, str]:
+        """여러 Notion 작업을 배치 요청으로 묶어 Google Tasks에 추가
+
+        GOOGLE_BATCH_SIZE개씩 한 번의 HTTP 요청으로 보내고, 응답은 request_id로
+        넘긴 Notion 페이지 ID로 다시 매칭합니다. 실패한 작업(배치 요청 자체가 실패하면
+        그 배치의 모든 작업)은 건너뛰고 나머지를 계속 처리하며, 성공한 작업의 {Notion ID: Google Task ID}를 반환합니다.
+
+        추가 요청은 다시 보내면 작업이 두 번 만들어지므로, 서버가 거절했음이 확실한
+        오류(429/503)만 다시 보냅니다. 응답을 받지 못해 반영 여부를 알 수 없으면
+        목록을 다시 읽어 실제로 없는 작업만 다시 추가합니다.
+
+        만들어진 작업은 바로 연결 색인에 기록되고 배치마다 Notion에도 기록되므로,
+        실행이 중간에 끊겨도 다음 실행은 마지막 배치 이후부터 이어서 처리합니다.
+        """
+        created = {}
+        if self.plan is not None:
+            for notion_task in notion_tasks:
+                self.plan.create(notion_task.id, notion_task.title, notion_task.due)
+            return created
+        for start in range(0, len(notion_tasks), GOOGLE_BATCH_SIZE):
+            chunk = notion_tasks[start:start + GOOGLE_BATCH_SIZE]
+            bodies = {notion_task.id: notion_task.google_body() for notion_task in chunk}
+            results: Dict[str, GoogleTask] = {}
+            failures: Dict[str, Exception] = {}
+
+            def on_response(request_id, response, exception):
+                if exception is not None or response is None:
+                    failures[request_id] = exception
+                else:
+                    results[request_id] = GoogleTask.from_api(response)
+
+            batch = self.tasks_service.new_batch_http_request(callback=on_response)
+            for notion_task in chunk:
+                batch.add(
+                    self.tasks_service.tasks().insert(
+                        tasklist=self.tasklist_id,
+                        body=bodies[notion_task.id]
+                    ),
+                    request_id=notion_task.id
+                )
+            batch_started = utc_now()
+            try:
+                self._execute(batch, idempotent=False)
+                # 서버가 거절한 항목만 개별 요청으로 다시 추가합니다 (다른 오류는 이미 반영되었을 수 있음).
+                retry_ids = [notion_id for notion_id, e in failures.items() if was_rejected(e)]
+            except Exception as e:
+                try:
+                    if was_rejected(e) or classify(e) is None:
+                        raise
+                    # 연결 오류나 5xx처럼 배치가 반영되었는지 알 수 없으면 실제로 만들어진
+                    # 작업을 찾아 그대로 쓰고, 목록에 없는 작업만 다시 추가합니다.
+                    print(f"  • 배치 응답을 받지 못해 추가된 작업을 다시 확인합니다: {str(e)}")
+                    results = self._find_inserted_tasks(chunk, batch_started)
+                except Exception:
+                    # 이 배치의 작업만 실패로 기록하고 다음 배치를 계속 처리합니다.
+                    for notion_task in chunk:
+                        self._record_error(f"'{notion_task.title}' Google Tasks 추가 실패: {str(e)}")
+                    print(f"  • {min(start + len(chunk), len(notion_tasks))}/{len(notion_tasks)}개 처리")
+                    continue
+                failures = {notion_task.id: e for notion_task in chunk if notion_task.id not in results}
+                retry_ids = list(failures)
+
+            for notion_id in retry_ids:
+                try:
+                    results[notion_id] = GoogleTask.from_api(self._execute(self.tasks_service.tasks().insert(
+                        tasklist=self.tasklist_id,
+                        body=bodies[notion_id]
+                    ), idempotent=False))
+                except Exception as e:
+                    failures[notion_id] = e
+
+            for notion_task in chunk:
+                result = results.get(notion_task.id)
+                if result is None:
+                    self._record_error(f"'{notion_task.title}' Google Tasks 추가 실패: {failures.get(notion_task.id)}")
+                    continue
+                self._link_created_task(notion_task, result, snapshot)
+                self.update_notion_task_sync_status(notion_task.id, result.id)
+                created[notion_task.id] = result.id
+            self.flush_notion_updates()
+            self.metrics.count('tasks_created', sum(1 for notion_task in chunk if notion_task.id in created))
+            print(f"  • {min(start + len(chunk), len(notion_tasks))}/{len(notion_tasks)}개 처리")
+        return created
+
+    def _find_inserted_tasks(self, notion_tasks: List[NotionTask], since) -> Dict[str, GoogleTask]:
+        """응답을 받지 못한 추가 요청 중 실제로 만들어진 작업 찾기
+
+        since 이후 바뀐 Google Tasks를 다시 읽어 요청한 본문과 내용 키가 같은 작업을
+        {Notion ID: Google Task}로 반환합니다.
+        """
+        keys = {notion_task.content_key(): notion_task.id for notion_task in notion_tasks}
+        found = {}
+        # 서버와 이 컴퓨터의 시계 차이를 고려해 조금 앞에서부터 읽습니다.
+        for task in self._iter_google_tasks(updated_min=format_timestamp(since - WATERMARK_MARGIN),
+                                            fields=GoogleTasksSnapshot.FIELDS):
+            notion_id = keys.get(task.content_key())
+            if notion_id:
+                found.setdefault(notion_id, task)
+        return found
 
     def update_notion_task_sync_status(self, task_id: str, google_task_id: str):
-        """Notion 작업의 동기화 상태 업데이트"""
-        self.notion.pages.update(
-            page_id=task_id,
-            properties={
-                "google 업로드": {"select": {"name": "완료"}}
-            }
-        )
+        """Notion 작업의 동기화 상태 업데이트 예약
 
-    def check_completed_google_tasks(self):
-        """완료된 Google Tasks 확인 및 Notion 업데이트"""
+        remark와 동기화 상태를 같은 변경으로 묶어 flush_notion_updates()에서
+        한 번에 기록합니다.
+        """
+        self.queue_notion_update(task_id, {
+            **self._remark_property(google_task_id),
+            "google 업로드": {"select": {"name": "완료"}}
+        })
+
+    def check_completed_google_tasks(self, snapshot: Optional[GoogleTasksSnapshot] = None):
+        """완료된 Google Tasks 확인 및 Notion 업데이트
+
+        먼저 완료된 작업마다 연결된 Notion 페이지를 모으고, 연결 색인과 notes로 찾지
+        못한 작업은 remark 검색(or 조건으로 묶은 조회)으로 한꺼번에 찾습니다. 모은 변경은
+        비동기 작업자 풀로 한 번에 기록하고, Notion ID로 기록에 실패한 작업만 remark
+        검색으로 다시 시도합니다. 연결 색인의 마지막 동기화 상태가 이미 '완료'인 작업은
+        다시 쓰지 않습니다. 작업별 출력은 verbose일 때만 보여 주고 끝에 요약을 출력합니다.
+        """
         print("\nGoogle Tasks의 완료된 작업을 확인합니다...")
         try:
-            tasks = self.tasks_service.tasks().list(
-                tasklist=self.tasklist_id,
-                showCompleted=True,
-                showHidden=True,  # 숨겨진 작업도 포함
-                maxResults=100
-            ).execute()
+            # 스냅샷이 없으면 숨겨진 작업도 포함해 모든 페이지를 스트리밍으로 확인합니다.
+            if snapshot is not None:
+                tasks = iter(snapshot)
+            else:
+                tasks = self._iter_google_tasks(fields='id,title,notes,status,completed')
             
-            print(f"가져온 전체 작업 수: {len(tasks.get('items', []))}")
+            # 1. 완료된 작업과 연결된 Notion ID 모으기
+            task_count = 0
+            unchanged_count = 0
+            completed_tasks = {}  # Notion ID -> 완료된 Google Task
+            unlinked = []  # Notion ID를 모르는 완료된 Google Task
+            for task in tasks:
+                task_count += 1
+                if not task.completed:
+                    continue
+                notion_id = self.id_map.notion_id_for(task.id) or task.notion_id
+                if not notion_id:
+                    unlinked.append(task)
+                    continue
+                if notion_id in self.failed_pages:
+                    # 이번 실행에서 이미 기록에 실패한 페이지 (오류는 기록됨, 다음 실행에서 다시 시도)
+                    continue
+                synced = self.id_map.synced_state(notion_id)
+                if synced and synced.get('completed'):
+                    # 이전 실행에서 이미 반영한 완료 상태
+                    unchanged_count += 1
+                    continue
+                self._detail(f"  • '{task.title}' 완료 → Notion {notion_id}")
+                self.queue_notion_update(notion_id, {"완료여부": {"checkbox": True}},
+                                         synced_state={**(synced or task.record()), 'completed': True})
+                completed_tasks[notion_id] = task
             
-            completed_count = 0
-            for task in tasks.get('items', []):
-                status = task.get('status', '')
-                title = task.get('title', '')
-                completed = task.get('completed')
-                
-                print(f"• 작업: '{title}' (상태: {status}, 완료일: {completed})")
-                
-                if status == 'completed' or completed:
-                    print(f"  - 완료된 작업 발견")
-                    # Notion Task ID 추출 시도
-                    notes = task.get('notes', '')
-                    notion_id = None
-                    
-                    # 1. notes에서 Notion ID 찾기
-                    if 'Notion Task ID:' in notes:
-                        notion_id = notes.split('Notion Task ID:')[1].strip().split('\n')[0]
-                        print(f"  - Notion ID 찾음: {notion_id}")
-                    
-                    if notion_id:
-                        try:
-                            # Notion 작업 완료 상태로 업데이트
-                            self.notion.pages.update(
-                                page_id=notion_id,
-                                properties={
-                                    "완료여부": {"checkbox": True}
-                                }
-                            )
-                            completed_count += 1
-                            print(f"  - Notion 작업 완료 상태로 업데이트 성공")
-                        except Exception as e:
-                            print(f"  - Notion ID로 업데이트 실패: {str(e)}")
-                            # 2. Google Task ID로 Notion 작업 찾기 시도
-                            try:
-                                notion_tasks = self.notion.databases.query(
-                                    database_id=self.database_id,
-                                    filter={
-                                        "property": "remark",
-                                        "rich_text": {
-                                            "contains": f"Google Task ID: {task['id']}"
-                                        }
-                                    }
-                                ).get('results', [])
-                                
-                                if notion_tasks:
-                                    notion_task = notion_tasks[0]
-                                    self.notion.pages.update(
-                                        page_id=notion_task['id'],
-                                        properties={
-                                            "완료여부": {"checkbox": True}
-                                        }
-                                    )
-                                    completed_count += 1
-                                    print(f"  - Google Task ID로 Notion 작업 찾아서 업데이트 성공")
-                                else:
-                                    print(f"  - Google Task ID로도 Notion 작업을 찾을 수 없음")
-                            except Exception as e2:
-                                print(f"  - Google Task ID로도 업데이트 실패: {str(e2)}")
-                    else:
-                        print(f"  - Notion ID를 찾을 수 없음")
+            # 2. Notion ID를 모르는 작업은 remark의 Google Task ID로 한꺼번에 찾기
+            relinked, not_found, already_done = self._relink_completed_tasks(unlinked)
+            unchanged_count += already_done
+            completed_tasks.update(relinked)
             
-            if completed_count > 0:
-                print(f"\n총 {completed_count}개의 작업 완료 상태를 Notion에 반영했습니다.")
-            else:
-                print("\n완료 상태를 반영한 작업이 없습니다.")
+            # 3. 모은 변경을 한 번에 기록
+            failures = self.flush_notion_updates()
+            completed_count = len(completed_tasks) - len(failures)
+            
+            # 4. notes의 Notion ID로 기록하지 못한 작업은 Google Task ID로 다시 찾아 기록
+            retry_tasks = [completed_tasks[notion_id] for notion_id in failures if notion_id not in relinked]
+            if retry_tasks:
+                relinked, retry_not_found, retry_done = self._relink_completed_tasks(retry_tasks)
+                not_found += retry_not_found
+                unchanged_count += retry_done
+                retry_failures = self.flush_notion_updates()
+                completed_count += len(relinked) - len(retry_failures)
+            
+            self.metrics.count('tasks_completed', completed_count)
+            print(f"확인한 작업 {task_count}개 중 완료 상태 반영 {completed_count}개, "
+                  f"이미 반영됨 {unchanged_count}개")
+            if not_found:
+                print(f"Notion 작업을 찾지 못한 완료 작업 {not_found}개는 건너뛰었습니다.")
         except Exception as e:
-            print(f"Google Tasks 가져오기 실패: {str(e)}")
+            self._record_error(f"완료된 Google Tasks 반영 실패: {str(e)}")
+
+    def _relink_completed_tasks(self, tasks: List[GoogleTask]) -> Tuple[Dict[str, GoogleTask], int, int]:
+        """remark의 Google Task ID로 완료된 작업의 Notion 페이지를 찾아 연결하고 완료 기록 예약
+
+        ({Notion ID: Google Task} 예약한 작업, 찾지 못한 수, 이미 완료된 수)를 반환합니다.
+        """
+        relinked = {}
+        not_found = already_done = 0
+        if not tasks:
+            return relinked, not_found, already_done
+        found = self._find_notion_tasks_by_google_id([task.id for task in tasks])
+        for task in tasks:
+            if task.id not in found:
+                # 검색 자체가 실패한 작업 (오류는 이미 기록됨)
+                continue
+            notion_task = found[task.id]
+            if notion_task is None:
+                not_found += 1
+                self._detail(f"  • '{task.title}' Notion 작업을 찾을 수 없음")
+                continue
+            if notion_task.id in self.failed_pages:
+                continue
+            synced = {**task.record(), 'completed': True}
+            self.id_map.record(notion_task.id, task.id, task.etag, task.updated)
+            if notion_task.completed:
+                self.id_map.save_synced_state(notion_task.id, synced)
+                already_done += 1
+                continue
+            self._detail(f"  • '{task.title}' 완료 → Notion {notion_task.id} (Google Task ID로 찾음)")
+            self.queue_notion_update(notion_task.id, {"완료여부": {"checkbox": True}}, synced_state=synced)
+            relinked[notion_task.id] = task
+        return relinked, not_found, already_done
 
-    def get_all_notion_tasks(self) -> List[Dict]:
-        """Notion 데이터베이스에서 모든 작업 목록 가져오기"""
-        response = self.notion.databases.query(
-            database_id=self.database_id
+    def _find_notion_tasks_by_google_id(self, google_task_ids: List[str]) -> Dict[str, Optional[NotionTask]]:
+        """remark에 Google Task ID가 적힌 Notion 작업 찾기
+
+        {Google Task ID: Notion 작업 또는 None}을 반환하며, 조회에 실패한 ID는 빠집니다.
+        """
+        found = {}
+        for start in range(0, len(google_task_ids), NOTION_OR_FILTER_SIZE):
+            chunk = google_task_ids[start:start + NOTION_OR_FILTER_SIZE]
+            try:
+                notion_tasks = list(self._iter_notion_tasks(filter={
+                    "or": [
+                        {"property": "remark", "rich_text": {"contains": f"{GOOGLE_ID_MARKER} {task_id}"}}
+                        for task_id in chunk
+                    ]
+                }))
+            except Exception as e:
+                self._record_error(f"Google Task ID {len(chunk)}개로 Notion 작업 검색 실패: {str(e)}")
+                continue
+            # contains는 부분 일치이므로 ID가 정확히 같은 페이지만 고릅니다.
+            by_google_id = {notion_task.google_id: notion_task for notion_task in notion_tasks}
+            for task_id in chunk:
+                found[task_id] = by_google_id.get(task_id)
+        return found
+
+    def get_uploaded_notion_tasks(self, edited_after: str = None) -> Iterator[NotionTask]:
+        """Notion 데이터베이스에서 Google Tasks에 업로드된 작업 목록 가져오기
+
+        edited_after를 주면 그 시각 이후 수정된 페이지만 가져옵니다.
+        """
+        if not edited_after:
+            return self._iter_notion_tasks(filter=UPLOADED_FILTER)
+        return self._iter_notion_tasks(
+            filter={
+                "and": [
+                    UPLOADED_FILTER,
+                    {
+                        "timestamp": "last_edited_time",
+                        "last_edited_time": {
+                            "on_or_after": edited_after
+                        }
+                    }
+                ]
+            }
         )
-        return response['results']
 
-    def get_all_google_tasks(self) -> List[Dict]:
+    def _iter_google_tasks(self, updated_min: str = None, completed_min: str = None,
+                           fields: str = None, show_deleted: bool = False) -> Iterator[GoogleTask]:
+        """Google Tasks 목록을 nextPageToken을 따라가며 하나씩 반환 (완료/숨김 작업 포함)
+
+        updated_min/completed_min은 RFC 3339 시각 문자열이며, fields를 주면
+        'items(...)' 부분 응답만 요청합니다 (예: 'id,title,notes'). 각 작업은 받자마자
+        GoogleTask로 바꿉니다.
+        """
+        params = {
+            'tasklist': self.tasklist_id,
+            'showCompleted': True,
+            'showHidden': True,
+            'showDeleted': show_deleted,
+            'maxResults': 100
+        }
+        if updated_min:
+            params['updatedMin'] = updated_min
+        if completed_min:
+            params['completedMin'] = completed_min
+        if fields:
+            # 다음 페이지를 따라가려면 nextPageToken이 응답에 포함되어야 합니다.
+            params['fields'] = f"nextPageToken,items({fields})"
+
+        if self.tasklist_id == PLANNED_TASKLIST_ID:
+            # 계획 실행에서 새로 만들 리스트는 비어 있습니다.
+            return
+        page_token = None
+        while True:
+            if page_token:
+                params['pageToken'] = page_token
+            response = self._execute(self.tasks_service.tasks().list(**params))
+            for item in response.get('items', []):
+                yield GoogleTask.from_api(item)
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+    def load_google_snapshot(self, updated_min: str = None) -> GoogleTasksSnapshot:
+        """Google Tasks 목록을 한 번 가져와 이번 실행용 스냅샷 생성
+
+        updated_min을 주면 그 이후 변경(삭제 포함)된 작업만 담긴 부분 스냅샷을 만듭니다.
+        """
+        try:
+            tasks = self._iter_google_tasks(updated_min=updated_min, fields=GoogleTasksSnapshot.FIELDS,
+                                            show_deleted=updated_min is not None)
+            return GoogleTasksSnapshot(tasks, complete=updated_min is None)
+        except HttpError as e:
+            print(f"Google Tasks를 가져오는 중 오류 발생: {e}")
+            raise
+
+    def _record_snapshot_links(self, snapshot: GoogleTasksSnapshot):
+        """스냅샷의 notes 표식으로 연결 색인과 etag/updated 정보를 갱신"""
+        self.id_map.record_many(
+            (notion_id, task_id, snapshot.by_id[task_id].etag, snapshot.by_id[task_id].updated)
+            for notion_id, task_id in snapshot.by_notion_id.items()
+        )
+
+    def get_all_google_tasks(self) -> List[GoogleTask]:
         """Google Tasks에서 모든 작업 가져오기 (완료된 작업 포함)"""
         try:
-            tasks = self.tasks_service.tasks().list(
-                tasklist=self.tasklist_id,
-                showCompleted=True,
-                showHidden=True,
-                maxResults=100
-            ).execute()
-            return tasks.get('items', [])
+            return list(self._iter_google_tasks())
         except HttpError as e:
             print(f"Google Tasks를 가져오는 중 오류 발생: {e}")
             return []
 
-    def validate_task_sync(self):
-        """작업 동기화 상태 검증"""
+    def _google_task_exists(self, task_id: str, snapshot: GoogleTasksSnapshot) -> bool:
+        """스냅샷으로 Google Task 존재 여부 판단 (부분 스냅샷에 없으면 변경 없이 남아 있는 작업)"""
+        if snapshot.get(task_id):
+            return True
+        if snapshot.complete or task_id in snapshot.deleted_ids:
+            return False
+        return True
+
+    def _fetch_google_task(self, task_id: str) -> Optional[GoogleTask]:
+        """작업 ID로 Google Task 하나를 직접 조회 (없으면 None)"""
+        try:
+            return GoogleTask.from_api(self._execute(self.tasks_service.tasks().get(
+                tasklist=self.tasklist_id,
+                task=task_id,
+                fields=GoogleTasksSnapshot.FIELDS
+            )))
+        except HttpError as e:
+            if e.resp.status in (404, 410):
+                return None
+            raise
+
+    def validate_task_sync(self, snapshot: Optional[GoogleTasksSnapshot] = None,
+                           edited_after: str = None, flush: bool = True) -> List[NotionTask]:
+        """작업 동기화 상태 검증
+
+        edited_after를 주면 그 이후 수정된 Notion 작업만 검증합니다.
+        flush=False이면 업로드 상태 초기화를 예약만 해 두고 기록하지 않습니다.
+        초기화된 Notion 작업 목록을 반환합니다.
+        """
         print("\n작업 동기화 상태를 검증합니다...")
+        items_before = dict(self.metrics.items)
         
-        # 모든 Notion 작업과 Google Tasks 가져오기
-        notion_tasks = self.get_all_notion_tasks()
-        google_tasks = self.get_all_google_tasks()
-        
-        # Google Tasks ID와 Notion ID 매핑 생성
-        google_task_map = {}  # Notion Task ID -> Google Task
-        
-        # Google Tasks 매핑
-        for task in google_tasks:
-            notes = task.get('notes', '')
-            if 'Notion Task ID:' in notes:
-                notion_id = notes.split('Notion Task ID:')[1].strip().split('\n')[0]
-                google_task_map[notion_id] = task
+        # 업로드된 Notion 작업과 Google Tasks 가져오기
+        # (스냅샷의 Notion ID 색인이 Notion Task ID -> Google Task 매핑 역할을 합니다)
+        notion_tasks = self.get_uploaded_notion_tasks(edited_after)
+        if snapshot is None:
+            snapshot = GoogleTasksSnapshot(self.get_all_google_tasks())
         
         # 검증 및 수정
+        reset_tasks = []
+        checked_ids = set()
         for task in notion_tasks:
-            notion_id = task['id']
-            if task['properties'].get('google 업로드') and \
-               task['properties']['google 업로드']['select'] and \
-               task['properties']['google 업로드']['select']['name'] == "완료":
+            notion_id = task.id
+            checked_ids.add(notion_id)
+            if task.uploaded:
                 
                 # Google Task가 존재하지 않는 경우
-                if notion_id not in google_task_map:
-                    # remark 필드에서 Google Task ID 찾기
-                    remark = task['properties'].get('remark', {}).get('rich_text', [])
-                    google_task_id = None
-                    if remark and 'Google Task ID:' in remark[0]['text']['content']:
-                        google_task_id = remark[0]['text']['content'].split('Google Task ID:')[1].strip()
+                if notion_id not in snapshot.by_notion_id:
+                    # 연결 색인, 없으면 remark 필드에서 Google Task ID 찾기
+                    google_task_id = self.id_map.google_id_for(notion_id)
+                    indexed = google_task_id is not None
+                    if not indexed:
+                        google_task_id = task.google_id
                     
                     if google_task_id:
                         # Google Task ID로 작업 찾기
-                        matching_tasks = [t for t in google_tasks if t['id'] == google_task_id]
-                        if matching_tasks:
+                        matching_task = snapshot.get(google_task_id)
+                        if not matching_task and not snapshot.complete and \
+                           google_task_id not in snapshot.deleted_ids:
+                            # 부분 스냅샷에 없는 작업은 워터마크 이후 바뀌지 않은 작업입니다.
+                            # 색인에 있고 Notion 쪽도 마지막 동기화 상태 그대로면 확인할 것이 없고,
+                            # 그 밖에는 직접 조회해 연결을 확인하고 Notion 쪽 변경을 반영합니다.
+                            if indexed and task.record() == self.id_map.synced_state(notion_id):
+                                continue
+                            matching_task = self._fetch_google_task(google_task_id)
+                            if matching_task:
+                                snapshot.add(matching_task)
+                                if matching_task.notion_id == notion_id:
+                                    self.id_map.record(notion_id, google_task_id,
+                                                       matching_task.etag, matching_task.updated)
+                                    self.reconcile_task(task, matching_task, snapshot)
+                                    continue
+                        if matching_task and self.plan is not None:
+                            self.plan.repair('google_notes', notion_id, google_task_id, task.title)
+                            self.metrics.count('links_repaired')
+                            continue
+                        if matching_task:
                             # 연결 정보 복구
-                            self.tasks_service.tasks().update(
+                            updated_task = GoogleTask.from_api(self._execute(self.tasks_service.tasks().patch(
                                 tasklist=self.tasklist_id,
                                 task=google_task_id,
                                 body={
-                                    'notes': f"Notion Task ID: {notion_id}"
+                                    'notes': task.notes
                                 }
-                            ).execute()
-                            print(f"  • '{task['properties']['이름']['title'][0]['text']['content']}' 연결 정보를 복구했습니다.")
+                            )))
+                            self.write_count += 1
+                            self.metrics.count('links_repaired')
+                            snapshot.add(updated_task)
+                            self.id_map.record(notion_id, google_task_id, updated_task.etag, updated_task.updated)
+                            print(f"  • '{task.title}' 연결 정보를 복구했습니다.")
                             continue
                     
-                    title = task['properties']['이름']['title'][0]['text']['content']
-                    print(f"경고: Notion 작업 '{title}'의 Google Task가 존재하지 않습니다.")
+                    print(f"경고: Notion 작업 '{task.title}'의 Google Task가 존재하지 않습니다.")
+                    if self.plan is not None:
+                        self.plan.reset(notion_id, task.title)
                     # google 업로드 상태 초기화
-                    self.notion.pages.update(
-                        page_id=notion_id,
-                        properties={
-                            "google 업로드": {"select": None}
-                        }
-                    )
-                    print("→ Notion의 업로드 상태를 초기화했습니다.")
+                    self.id_map.remove(notion_id)
+                    self.queue_notion_update(notion_id, {"google 업로드": {"select": None}})
+                    self.metrics.count('tasks_reset')
+                    reset_tasks.append(task)
+                    print("→ Notion의 업로드 상태를 초기화합니다.")
+                else:
+                    # 연결된 작업은 양쪽에서 바뀐 필드만 서로 반영합니다.
+                    self.reconcile_task(task, snapshot.find_by_notion_id(notion_id), snapshot)
+        
+        # 부분 스냅샷에서 Google 쪽만 바뀐 작업은 Notion 페이지를 직접 가져와 비교합니다.
+        if not snapshot.complete:
+            self._reconcile_google_changes(snapshot, checked_ids)
+        
+        # 부분 스냅샷에서 삭제가 확인된 작업은 Notion 페이지가 수정되지 않았어도 초기화합니다.
+        for google_task_id in snapshot.deleted_ids:
+            notion_id = self.id_map.notion_id_for(google_task_id)
+            if not notion_id or notion_id in checked_ids or notion_id in snapshot.by_notion_id:
+                continue
+            print(f"경고: Notion 작업 {notion_id}의 Google Task가 삭제되었습니다.")
+            if self.plan is not None:
+                self.plan.reset(notion_id)
+            self.id_map.remove(notion_id)
+            self.queue_notion_update(notion_id, {"google 업로드": {"select": None}})
+            self.metrics.count('tasks_reset')
+            print("→ Notion의 업로드 상태를 초기화합니다.")
+        
+        reconciled = {name: self.metrics.items.get(name, 0) - items_before.get(name, 0)
+                      for name in ('google_updated', 'notion_updated')}
+        if any(reconciled.values()):
+            print(f"변경 반영: Notion → Google Tasks {reconciled['google_updated']}개, "
+                  f"Google Tasks → Notion {reconciled['notion_updated']}개")
+        
+        if flush:
+            self.flush_notion_updates()
+        return reset_tasks
 
-    def get_existing_task_names(self) -> Set[str]:
-        """Google Tasks에 있는 모든 작업 이름 가져오기"""
-        try:
-            tasks = self.tasks_service.tasks().list(
-                tasklist=self.tasklist_id,
-                showCompleted=True,
-                showHidden=True,
-                maxResults=100
-            ).execute()
-            
-            return {task['title'] for task in tasks.get('items', [])}
-        except HttpError as e:
-            print(f"Google Tasks 목록을 가져오는 중 오류 발생: {e}")
-            return set()
+    def reconcile_task(self, notion_task: NotionTask, google_task: GoogleTask,
+                       snapshot: Optional[GoogleTasksSnapshot] = None):
+        """연결된 두 작업을 마지막 동기화 상태와 비교해 바뀐 필드만 반대쪽에 기록
+
+        Google 쪽은 tasks().patch로 바로 고치고, Notion 쪽은 다른 변경과 합쳐
+        기록하도록 예약합니다. 양쪽이 같으면 아무것도 쓰지 않습니다.
+        """
+        notion_id = notion_task.id
+        notion = notion_task.record()
+        google = google_task.record()
+        synced = self.id_map.synced_state(notion_id)
+        if notion == google:
+            if synced != notion:
+                self.id_map.save_synced_state(notion_id, notion)
+            return
+        
+        notion_newer = notion_task.last_edited > (google_task.updated or '')
+        to_google, to_notion = diff_records(notion, google, synced, notion_newer)
+        merged = {**notion, **to_notion}
+        
+        if to_google and self.plan is not None:
+            self.plan.update_google(google_task.id, notion_id, notion['title'], to_google)
+            self.metrics.count('google_updated')
+        elif to_google:
+            try:
+                updated_task = GoogleTask.from_api(self._execute(self.tasks_service.tasks().patch(
+                    tasklist=self.tasklist_id,
+                    task=google_task.id,
+                    body=google_patch_body(to_google)
+                )))
+            except Exception as e:
+                self._record_error(f"'{notion['title']}' Google Tasks 변경 반영 실패: {str(e)}")
+                return
+            self.write_count += 1
+            self.metrics.count('google_updated')
+            if snapshot is not None:
+                snapshot.add(updated_task)
+            self.id_map.record(notion_id, google_task.id, updated_task.etag, updated_task.updated)
+            self._detail(f"  • '{notion['title']}' → Google Tasks: {', '.join(to_google)}")
+        
+        if to_notion:
+            self.queue_notion_update(notion_id, notion_properties(to_notion), synced_state=merged)
+            self.metrics.count('notion_updated')
+            self._detail(f"  • '{google['title']}' → Notion: {', '.join(to_notion)}")
+        else:
+            self.id_map.save_synced_state(notion_id, merged)
+
+    def _reconcile_google_changes(self, snapshot: GoogleTasksSnapshot, checked_ids: Set[str]):
+        """이번 실행에서 확인하지 않은 Notion 페이지 중 Google 쪽이 바뀐 작업 비교
 
-    def sync_tasks(self):
-        """작업 동기화 실행"""
+        비교할 Notion 페이지는 remark의 Google Task ID로 묶어 한꺼번에 조회하고,
+        그렇게 찾지 못한 페이지만 하나씩 가져옵니다.
+        """
+        changed = []  # (Notion ID, Google Task)
+        for notion_id, google_task_id in list(snapshot.by_notion_id.items()):
+            if notion_id in checked_ids:
+                continue
+            google_task = snapshot.get(google_task_id)
+            if google_task.record() == self.id_map.synced_state(notion_id):
+                continue
+            changed.append((notion_id, google_task))
+        if not changed:
+            return
+        
+        found = self._find_notion_tasks_by_google_id([google_task.id for _, google_task in changed])
+        for notion_id, google_task in changed:
+            notion_task = found.get(google_task.id)
+            if notion_task is None or notion_task.id != notion_id:
+                try:
+                    notion_task = self._retrieve_notion_page(notion_id)
+                except Exception as e:
+                    self._record_error(f"Notion 페이지 {notion_id} 조회 실패: {str(e)}")
+                    continue
+            # 검증 단계와 같이 업로드 상태가 '완료'인 페이지만 비교합니다.
+            if notion_task.archived or not notion_task.uploaded:
+                continue
+            self.reconcile_task(notion_task, google_task, snapshot)
+
+    def sync_tasks(self, full: bool = False) -> int:
+        """작업 동기화 실행
+
+        이전 실행의 워터마크가 있으면 그 이후 변경된 항목만 확인하고,
+        full=True이면 전체 데이터를 다시 확인합니다. 이번 실행에서 기록한
+        변경 수를 반환합니다.
+        """
         print("Notion 작업을 Google Tasks와 동기화합니다...")
+        run_started = utc_now()
+        writes_before = self.write_count
+        self.errors = []
+        self.failed_pages = set()
+        self.metrics.reset()
+        state = SyncState(self.database_id, self.tasklist_id, self.pair.state_dir).load()
+        since = None if full else state.watermark
+        if since and self.id_map.is_empty():
+            # 연결 색인이 없어졌다면 전체 목록의 notes 표식으로부터 다시 만듭니다.
+            print("ID 연결 색인이 비어 있어 Google Tasks 전체 목록으로 다시 만듭니다.")
+            since = None
+        if since:
+            print(f"{since} 이후 변경된 항목만 확인합니다.")
+        else:
+            print("전체 항목을 확인합니다.")
+        if self.plan is not None:
+            print("계획 모드: Google Tasks와 Notion에 아무것도 기록하지 않습니다.")
+            self.plan.since = since
         
-        # 0. 기존 동기화 상태 검증
-        self.validate_task_sync()
+        with self.metrics.phase('list'):
+            # Google Tasks 목록은 이번 실행에서 한 번만 가져와 모든 단계가 공유합니다.
+            snapshot = self.load_google_snapshot(updated_min=since)
+            print(f"Google Tasks {len(snapshot)}개를 불러왔습니다.")
+            self._record_snapshot_links(snapshot)
         
-        # 1. Google Tasks의 기존 작업 이름 가져오기
-        existing_task_names = self.get_existing_task_names()
+        with self.metrics.phase('validate'):
+            # 0. 기존 동기화 상태 검증
+            # 초기화된 작업은 아직 Notion에 기록되지 않았으므로 아래에서 직접 후보에 넣고,
+            # 다시 추가되면 초기화와 새 연결 정보가 한 번의 업데이트로 합쳐집니다.
+            reset_tasks = self.validate_task_sync(snapshot, edited_after=since, flush=False)
         
-        # 2. 노션에서 동기화되지 않은 작업 가져오기
-        notion_tasks = self.get_notion_tasks()
-        new_tasks = []
-        skipped_tasks = []
+        with self.metrics.phase('create'):
+            # 1. 노션에서 동기화되지 않은 작업 가져오기
+            # 페이지 단위로 스트리밍되므로 전체 개수는 순회하면서 셉니다.
+            notion_tasks = self.get_notion_tasks()
+            notion_task_count = 0
+            new_tasks = []
         
-        # 3. 중복 작업 필터링
-        for task in notion_tasks:
-            title = task['properties']['이름']['title']
-            task_name = title[0]['text']['content'] if title else '제목 없음'
+            # 2. 이미 Google Task가 있는 작업 걸러내기
+            # 제목이 아니라 Notion ID 기준이므로 이름이 같은 다른 작업(반복 습관 등)은 건너뛰지 않고,
+            # 연결 색인과 스냅샷의 내용 키 색인으로 작업마다 O(1)에 확인합니다.
+            resumed_count = 0
+            for task in itertools.chain(reset_tasks, notion_tasks):
+                notion_task_count += 1
             
-            if task_name in existing_task_names:
-                skipped_tasks.append(task_name)
-            else:
+                # 이 페이지로 만든 것과 내용까지 같은 작업이 목록에 있으면 그 작업에 연결하고,
+                # 양쪽 값이 같으므로 이후 비교의 기준(마지막 동기화 상태)으로 저장합니다.
+                duplicate = snapshot.find_by_key(task.content_key())
+                if duplicate and self.id_map.synced_state(task.id) is None:
+                    self.id_map.record(task.id, duplicate.id, duplicate.etag, duplicate.updated)
+                    self.id_map.save_synced_state(task.id, duplicate.record())
+                
+                # 이전 실행이 Google Task를 만든 뒤 Notion에 기록하기 전에 중단된 작업은
+                # 연결 색인에 남은 Google Task ID로 Notion 기록만 이어서 합니다.
+                google_task_id = self.id_map.google_id_for(task.id)
+                if google_task_id:
+                    if self._google_task_exists(google_task_id, snapshot):
+                        if self.plan is not None:
+                            self.plan.repair('notion_link', task.id, google_task_id, task.title)
+                        self.update_notion_task_sync_status(task.id, google_task_id)
+                        resumed_count += 1
+                        continue
+                    self.id_map.remove(task.id)
                 new_tasks.append(task)
         
-        print(f"\n동기화되지 않은 작업 {len(notion_tasks)}개 중:")
-        if skipped_tasks:
-            print(f"- {len(skipped_tasks)}개 작업이 이미 존재하여 건너뜁니다:")
-            for task_name in skipped_tasks:
-                print(f"  • {task_name}")
+            self.metrics.count('tasks_resumed', resumed_count)
+            print(f"\n동기화되지 않은 작업 {notion_task_count}개 중:")
+            if resumed_count:
+                print(f"- {resumed_count}개 작업은 이미 Google Tasks에 있어 연결 정보만 기록합니다.")
         
-        if new_tasks:
-            print(f"- {len(new_tasks)}개 작업을 동기화합니다:")
-            # 4. 새로운 작업만 Google Tasks에 추가
-            for task in new_tasks:
-                title = task['properties']['이름']['title']
-                task_name = title[0]['text']['content'] if title else '제목 없음'
-                print(f"  • '{task_name}' 동기화 중...")
-                google_task_id = self.create_google_task(task)
-                self.update_notion_task_sync_status(task['id'], google_task_id)
-        else:
-            print("- 동기화할 새로운 작업이 없습니다.")
+            if new_tasks:
+                print(f"- {len(new_tasks)}개 작업을 동기화합니다:")
+                # 3. 새로운 작업만 Google Tasks에 배치로 추가 (배치마다 Notion에도 기록)
+                created = self.create_google_tasks(new_tasks, snapshot)
+                if self.plan is None and len(created) < len(new_tasks):
+                    print(f"- {len(new_tasks) - len(created)}개 작업은 추가하지 못했습니다.")
+            else:
+                print("- 동기화할 새로운 작업이 없습니다.")
         
-        # 5. 완료된 Google Tasks 확인 및 Notion 업데이트
-        print("\nGoogle Tasks의 완료된 작업을 Notion에 반영합니다...")
-        self.check_completed_google_tasks()
+            # 남은 Notion 변경(초기화, 이어서 기록할 연결 정보)을 페이지당 한 번씩 기록
+            self.flush_notion_updates()
         
+        with self.metrics.phase('completion'):
+            # 4. 완료된 Google Tasks 확인 및 Notion 업데이트
+            print("\nGoogle Tasks의 완료된 작업을 Notion에 반영합니다...")
+            self.check_completed_google_tasks(snapshot)
+        
+        # 같은 실패가 여러 단계에서 기록되었더라도 보고서에는 한 번만 남깁니다.
+        self.errors = list(dict.fromkeys(self.errors))
+        # 모든 단계가 실패 없이 끝났을 때만 워터마크를 앞으로 옮깁니다. 기록에 실패한
+        # 작업은 새 워터마크보다 오래되어 다음 증분 실행에서 다시 보지 않게 되므로,
+        # 오류가 있으면 워터마크를 그대로 두고 다음 실행이 같은 범위를 다시 확인합니다.
+        if self.plan is None:
+            if self.errors:
+                print(f"실패한 작업이 있어 워터마크를 옮기지 않습니다 (오류 {len(self.errors)}개).")
+            else:
+                state.save_watermark(run_started)
+        self.metrics.finish()
         print("동기화가 완료되었습니다!")
+        return self.write_count - writes_before
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Notion-Google Tasks 동기화')
+    parser.add_argument('--full', action='store_true',
+                        help='저장된 워터마크를 무시하고 전체 데이터를 다시 확인합니다')
+    parser.add_argument('--daemon', action='store_true',
+                        help='종료하지 않고 변경 사항을 계속 확인합니다')
+    parser.add_argument('--min-interval', type=float, default=MIN_POLL_INTERVAL,
+                        help='데몬 모드의 최소 폴링 간격(초)')
+    parser.add_argument('--max-interval', type=float, default=MAX_POLL_INTERVAL,
+                        help='데몬 모드의 최대 폴링 간격(초)')
+    parser.add_argument('--webhook-port', type=int,
+                        help='데몬 모드에서 Notion 웹훅을 받을 로컬 포트')
+    parser.add_argument('--webhook-host', default=DEFAULT_WEBHOOK_HOST,
+                        help='웹훅 서버가 받을 주소 (루프백이 아니면 NOTION_WEBHOOK_SECRET 필요)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='완료 반영 등 대량 처리에서도 작업별 결과를 출력합니다')
+    parser.add_argument('--pairs', default=SYNC_PAIRS_FILE,
+                        help='여러 데이터베이스/작업 목록 쌍을 동시에 동기화할 JSON 설정 파일')
+    parser.add_argument('--metrics-file',
+                        help='실행 통계를 저장할 파일 (.prom이면 Prometheus, 아니면 JSON 형식)')
+    parser.add_argument('--plan', action='store_true',
+                        help='아무것도 기록하지 않고 실행할 작업과 예상 API 호출 수/시간을 JSON으로 출력합니다')
+    args = parser.parse_args(argv)
+    if args.plan and args.daemon:
+        parser.error('--plan은 --daemon과 함께 쓸 수 없습니다')
+    if not args.pairs and not (NOTION_TOKEN and NOTION_DATABASE_ID):
+        # 설정 파일 없이 실행하면 환경 변수의 데이터베이스 하나를 동기화합니다
+        # (GOOGLE_TASKLIST_ID가 없으면 GOOGLE_TASKLIST_TITLE 이름의 목록을 찾거나 만듭니다).
+        parser.error('--pairs(SYNC_PAIRS_FILE)가 없으면 NOTION_TOKEN과 NOTION_DATABASE_ID 환경 변수가 필요합니다')
+    if args.webhook_port and not NOTION_WEBHOOK_SECRET and not is_loopback(args.webhook_host):
+        parser.error('NOTION_WEBHOOK_SECRET 없이는 루프백이 아닌 --webhook-host를 쓸 수 없습니다')
+    return args
+
+def build_sync(args):
+    """명령줄 인자에 맞는 동기화 객체 생성"""
+    if args.pairs:
+        # 클라이언트와 상태 파일은 메인 스레드에서 만들고, 동기화만 쌍별 작업자 스레드에서 실행
+        return MultiPairSync({pair.name: NotionGoogleTasksSync(pair, verbose=args.verbose, plan=args.plan)
+                              for pair in load_pairs(args.pairs)})
+    return NotionGoogleTasksSync(verbose=args.verbose, plan=args.plan)
+
+def run_plan(sync, full: bool):
+    """쓰기 없이 동기화를 실행하고 계획을 표준 출력에 JSON으로 출력
+
+    진행 상황 출력은 표준 오류로 보내 표준 출력에는 JSON만 남깁니다.
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        sync.sync_tasks(full=full)
+    report = sync.plan_report()
+    if sync.errors:
+        report['errors'] = list(sync.errors)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+def main(argv=None):
     """메인 동기화 함수"""
+    args = parse_args(argv)
     start_time = datetime.now()
     sync_results = {
         'success': True,
@@ -454,8 +1165,25 @@ def main():
         # GitHub Actions 환경에서 인증 정보 설정
         setup_google_credentials()
         
-        sync = NotionGoogleTasksSync()
-        sync.sync_tasks()
+        if args.plan:
+            # 태스크 리스트를 찾는 동안의 출력도 표준 출력의 JSON과 섞이지 않게 합니다.
+            with contextlib.redirect_stdout(sys.stderr):
+                sync = build_sync(args)
+            run_plan(sync, args.full)
+            return
+        sync = build_sync(args)
+        if args.daemon:
+            run_daemon(sync, args.min_interval, args.max_interval, args.webhook_port,
+                       metrics_file=args.metrics_file, webhook_host=args.webhook_host, full=args.full)
+            return
+        
+        sync.sync_tasks(full=args.full)
+        sync_results['tasks_synced'] = sync.metrics.items.get('tasks_created', 0)
+        sync_results['tasks_completed'] = sync.metrics.items.get('tasks_completed', 0)
+        sync_results['errors'].extend(sync.errors)
+        sync_results['success'] = not sync.errors
+        if args.metrics_file:
+            sync.metrics.export(args.metrics_file)
 
         # 실행 결과 메시지 생성
         duration = datetime.now() - start_time
@@ -463,20 +1191,34 @@ def main():
         message += f"⏱ 실행 시간: {duration.total_seconds():.1f}초\n"
         message += f"📋 동기화된 작업: {sync_results['tasks_synced']}개\n"
         message += f"✅ 완료된 작업: {sync_results['tasks_completed']}개\n"
+        if isinstance(sync, MultiPairSync):
+            message += f"\n🗂 <b>동기화 쌍</b>\n{sync.summary()}\n"
+        metrics_summary = sync.metrics.summary()
+        if metrics_summary:
+            message += f"\n{metrics_summary}\n"
         
         if sync_results['errors']:
             message += "\n⚠️ <b>오류 발생</b>\n"
             for error in sync_results['errors']:
-                message += f"- {error}\n"
+                # 오류 문구와 작업 제목에 <, & 가 있으면 HTML 메시지 전체가 거부됩니다.
+                message += f"- {html.escape(error)}\n"
 
         # 텔레그램으로 결과 전송
-        asyncio.run(send_telegram_message(message))
+        notify(message)
 
     except Exception as e:
-        error_message = f"❌ <b>동기화 중 오류 발생</b>\n\n{str(e)}"
-        asyncio.run(send_telegram_message(error_message))
+        error_message = f"❌ <b>동기화 중 오류 발생</b>\n\n{html.escape(str(e))}"
+        notify(error_message)
         logger.error(f"동기화 실패: {str(e)}")
         raise
+    finally:
+        stop_token_managers()
+        # 남은 알림은 제한 시간 안에서만 기다리고, 보내지 못해도 실행 결과는 바꾸지 않습니다.
+        notifier.flush()
+        transport = get_transport()
+        if transport.summary():
+            logger.info(f"연결 재사용 현황\n{transport.summary()}")
+        transport.close()
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
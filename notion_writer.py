@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from metrics import SyncMetrics
+from retry import RetryPolicy, classify
+from transport import SharedTransport, get_transport
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+# Notion API 공개 요청 한도 (통합당 평균 초당 3회)
+NOTION_RATE_LIMIT = 3.0
+NOTION_RATE_BURST = 3
+NOTION_WRITE_WORKERS = 4
+
+class TokenBucket:
+    """초당 rate개, 최대 burst개까지 몰아서 보낼 수 있는 요청 한도
+
+    요청마다 보낼 시각을 미리 예약(GCRA)하므로 여러 스레드(동기 호출)와 이벤트 루프
+    (AsyncNotionWriter)가 같은 버킷을 나눠 써도 합계가 한도를 넘지 않습니다.
+    429 응답의 Retry-After 동안은 pause()로 모든 요청을 멈춥니다.
+    """
+
+    def __init__(self, rate: float = NOTION_RATE_LIMIT, burst: int = NOTION_RATE_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.paused_until = 0.0
+        # 다음 요청의 이론적 도착 시각
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def reserve(self) -> float:
+        """요청 하나를 예약하고 보내기 전에 기다려야 할 시간 반환"""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1 / self.rate
+            send_at = max(now, self._next - (self.capacity - 1) * interval, self.paused_until)
+            self._next = max(self._next, send_at) + interval
+            return send_at - now
+
+    def _pause_remaining(self) -> float:
+        return self.paused_until - time.monotonic()
+
+    def wait(self):
+        """동기 코드용: 보낼 차례가 될 때까지 현재 스레드를 멈춤"""
+        time.sleep(self.reserve())
+        # 예약 뒤에 429로 멈춘 경우 멈춤이 끝날 때까지 더 기다립니다.
+        while self._pause_remaining() > 0:
+            time.sleep(self._pause_remaining())
+
+    async def acquire(self):
+        await asyncio.sleep(self.reserve())
+        while self._pause_remaining() > 0:
+            await asyncio.sleep(self._pause_remaining())
+
+_shared_buckets: Dict[str, TokenBucket] = {}
+_shared_buckets_lock = threading.Lock()
+
+def shared_bucket(token: str, rate: float = NOTION_RATE_LIMIT) -> TokenBucket:
+    """같은 Notion 토큰(통합)을 쓰는 모든 동기화 쌍이 함께 쓰는 요청 한도"""
+    with _shared_buckets_lock:
+        if token not in _shared_buckets:
+            _shared_buckets[token] = TokenBucket(rate)
+        return _shared_buckets[token]
+
+def _notion_async_client(token: str, transport: SharedTransport) -> 'AsyncClient':
+    from notion_client import AsyncClient
+    return AsyncClient(auth=token, client=transport.notion_async_http_client())
+
+class AsyncNotionWriter:
+    """Notion pages.update 요청을 요청 한도에 맞춰 동시에 처리하는 작업자 풀
+
+    NotionGoogleTasksSync가 모은 {페이지 ID: 속성} 변경을 받아 workers개의 작업자가
+    AsyncClient로 기록합니다. 요청 속도는 같은 토큰을 쓰는 모든 동기화 쌍이 함께 쓰는
+    TokenBucket으로 제한하고, 일시적인 오류는 RetryPolicy에 따라 다시 시도합니다. 429 응답이면 Retry-After 동안 모든 작업자를
+    멈춥니다. 클라이언트와 연결 풀은 SharedTransport의 이벤트 루프에서 한 번 만들어
+    실행(또는 데몬)이 끝날 때까지 재사용합니다.
+    """
+
+    def __init__(self, token: str = None, rate: float = NOTION_RATE_LIMIT,
+                 workers: int = NOTION_WRITE_WORKERS, retry_policy: RetryPolicy = None,
+                 client_factory: Callable[[], 'AsyncClient'] = None,
+                 transport: SharedTransport = None, metrics: SyncMetrics = None):
+        self.transport = transport or get_transport()
+        self.metrics = metrics or SyncMetrics()
+        self.client_factory = client_factory or (lambda: _notion_async_client(token, self.transport))
+        self.client: Optional['AsyncClient'] = None
+        self.bucket = shared_bucket(token, rate) if token else TokenBucket(rate)
+        self.workers = workers
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    async def _update_page(self, client: 'AsyncClient', page_id: str, properties: Dict):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            call_started = time.perf_counter()
+            try:
+                result = await client.pages.update(page_id=page_id, properties=properties)
+                self.metrics.record_call('pages.update', time.perf_counter() - call_started)
+                return result
+            except Exception as e:
+                self.metrics.record_call('pages.update', time.perf_counter() - call_started, e)
+                delay = self.retry_policy.next_delay(e, attempt, started)
+                if delay is None:
+                    raise
+                if classify(e).rate_limited:
+                    logger.warning(f"Notion 요청 한도 초과, {delay:.1f}초 동안 요청을 멈춥니다.")
+                    self.bucket.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+    async def update_pages(self, updates: Dict[str, Dict]) -> Dict[str, Exception]:
+        """모든 변경을 기록하고 실패한 페이지의 {페이지 ID: 예외} 반환"""
+        failures: Dict[str, Exception] = {}
+        if not updates:
+            return failures
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in updates.items():
+            queue.put_nowait(item)
+
+        if self.client is None:
+            self.client = self.client_factory()
+        client = self.client
+
+        async def worker():
+            while True:
+                try:
+                    page_id, properties = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await self._update_page(client, page_id, properties)
+                except Exception as e:
+                    failures[page_id] = e
+
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(updates)))))
+        return failures
+
+    def write(self, updates: Dict[str, Dict]) -> Dict[str, Exception]:
+        """동기 코드에서 호출하는 진입점 (공유 이벤트 루프에서 실행)"""
+        return self.transport.run(self.update_pages(updates))
@@ -0,0 +1,140 @@
+from typing import Dict, Optional
+
+from sync_diff import content_key
+
+# 양쪽 작업을 서로 연결하는 표식 (Google notes / Notion remark)
+NOTION_ID_MARKER = 'Notion Task ID:'
+GOOGLE_ID_MARKER = 'Google Task ID:'
+
+def extract_notion_id(notes: str) -> Optional[str]:
+    """Google Task notes에서 'Notion Task ID: ...' 표식을 찾아 Notion ID 반환"""
+    if notes and NOTION_ID_MARKER in notes:
+        return notes.split(NOTION_ID_MARKER)[1].strip().split('\n')[0] or None
+    return None
+
+def extract_google_id(remark: str) -> Optional[str]:
+    """Notion remark에서 'Google Task ID: ...' 표식을 찾아 Google Task ID 반환"""
+    if remark and GOOGLE_ID_MARKER in remark:
+        return remark.split(GOOGLE_ID_MARKER)[1].strip() or None
+    return None
+
+class NotionTask:
+    """동기화에 쓰는 값만 담은 Notion 작업
+
+    조회 응답의 중첩된 속성에서 필요한 값을 한 번만 꺼내고 원래 응답은 보관하지
+    않습니다. 스냅샷처럼 작업 수만큼 쌓이는 곳에서 페이지 dict 대신 사용합니다.
+    """
+
+    __slots__ = ('id', 'title', 'due', 'completed', 'uploaded', 'google_id', 'last_edited', 'archived')
+
+    def __init__(self, id: str, title: str = '제목 없음', due: Optional[str] = None,
+                 completed: bool = False, uploaded: bool = False, google_id: Optional[str] = None,
+                 last_edited: str = '', archived: bool = False):
+        self.id = id
+        self.title = title
+        # 마감일은 'YYYY-MM-DD' (없으면 None)
+        self.due = due
+        self.completed = completed
+        # google 업로드 상태가 '완료'인지
+        self.uploaded = uploaded
+        # remark에 기록된 Google Task ID
+        self.google_id = google_id
+        self.last_edited = last_edited
+        # 보관되었거나 휴지통에 있는 페이지
+        self.archived = archived
+
+    @classmethod
+    def from_page(cls, page: Dict) -> 'NotionTask':
+        """databases.query / pages.retrieve 응답의 페이지 하나를 변환"""
+        properties = page.get('properties', {})
+        title = (properties.get('이름') or {}).get('title', [])
+        date = (properties.get('날짜') or {}).get('date')
+        upload = (properties.get('google 업로드') or {}).get('select')
+        remark = (properties.get('remark') or {}).get('rich_text', [])
+        return cls(
+            page['id'],
+            title[0]['text']['content'] if title else '제목 없음',
+            due=date['start'][:10] if date and date.get('start') else None,
+            completed=bool((properties.get('완료여부') or {}).get('checkbox')),
+            uploaded=bool(upload and upload.get('name') == '완료'),
+            google_id=extract_google_id(remark[0]['text']['content']) if remark else None,
+            last_edited=page.get('last_edited_time', ''),
+            archived=bool(page.get('archived') or page.get('in_trash'))
+        )
+
+    def __repr__(self) -> str:
+        return f"NotionTask({self.id!r}, {self.title!r})"
+
+    @property
+    def notes(self) -> str:
+        """이 작업으로 만드는 Google Task의 notes (Notion ID 표식)"""
+        return f"{NOTION_ID_MARKER} {self.id}"
+
+    def record(self) -> Dict:
+        """양쪽 비교(diff_records)에 쓰는 필드"""
+        return {'title': self.title, 'due': self.due, 'completed': self.completed}
+
+    def google_body(self) -> Dict:
+        """Google Tasks에 추가할 작업 본문"""
+        body = {
+            'title': self.title,
+            'notes': self.notes,
+            'status': 'needsAction'
+        }
+        if self.due:
+            body['due'] = f"{self.due}T00:00:00.000Z"
+        return body
+
+    def content_key(self) -> str:
+        """google_body()로 만든 작업의 내용 키 (GoogleTask.content_key()와 같은 값)"""
+        return content_key(self.id, self.title, self.due, self.notes)
+
+class GoogleTask:
+    """동기화에 쓰는 값만 담은 Google Task
+
+    tasks().list/get/insert/patch 응답을 한 번만 변환하고, notes의 Notion ID도
+    이때 한 번만 찾아 둡니다.
+    """
+
+    __slots__ = ('id', 'title', 'due', 'notes', 'completed', 'notion_id', 'etag', 'updated', 'deleted')
+
+    def __init__(self, id: str, title: str = '', due: Optional[str] = None, notes: str = '',
+                 completed: bool = False, etag: Optional[str] = None, updated: Optional[str] = None,
+                 deleted: bool = False):
+        self.id = id
+        self.title = title
+        # 마감일은 'YYYY-MM-DD' (없으면 None)
+        self.due = due
+        self.notes = notes
+        self.completed = completed
+        self.notion_id = extract_notion_id(notes)
+        self.etag = etag
+        self.updated = updated
+        self.deleted = deleted
+
+    @classmethod
+    def from_api(cls, item: Dict) -> 'GoogleTask':
+        """Google Tasks API 응답의 작업 하나를 변환 (fields로 일부만 받은 응답도 가능)"""
+        return cls(
+            item['id'],
+            item.get('title', ''),
+            due=item['due'][:10] if item.get('due') else None,
+            notes=item.get('notes') or '',
+            completed=item.get('status') == 'completed' or bool(item.get('completed')),
+            etag=item.get('etag'),
+            updated=item.get('updated'),
+            deleted=bool(item.get('deleted'))
+        )
+
+    def __repr__(self) -> str:
+        return f"GoogleTask({self.id!r}, {self.title!r})"
+
+    def record(self) -> Dict:
+        """양쪽 비교(diff_records)에 쓰는 필드"""
+        return {'title': self.title, 'due': self.due, 'completed': self.completed}
+
+    def content_key(self) -> Optional[str]:
+        """중복 확인용 내용 키 (notes에 Notion ID가 없으면 None)"""
+        if not self.notion_id:
+            return None
+        return content_key(self.notion_id, self.title, self.due, self.notes)
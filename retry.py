@@ -0,0 +1,147 @@
+import sys
+import logging
+import random
+import socket
+import time
+from typing import Callable, Optional
+
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+# 일시적인 오류로 보고 다시 시도할 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Google API가 403으로 돌려주는 요청 한도 초과 사유
+GOOGLE_RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+# Notion API 오류 코드 중 다시 시도할 것
+NOTION_RETRYABLE_CODES = {'rate_limited', 'conflict_error', 'internal_server_error', 'service_unavailable'}
+
+# 서버가 요청을 처리하지 않고 거절했음을 뜻하는 상태 코드
+# (500/502/504나 연결 오류는 요청이 이미 반영된 뒤에 났을 수도 있습니다)
+REJECTED_STATUS = {429, 503}
+
+class RetryableError:
+    """classify()의 결과: 다시 시도할 수 있는 오류와 서버가 지정한 대기 시간"""
+
+    def __init__(self, retry_after: Optional[float] = None, rate_limited: bool = False):
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited
+
+def _parse_retry_after(value) -> Optional[float]:
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def classify(error: Exception) -> Optional[RetryableError]:
+    """오류가 일시적이면 RetryableError, 다시 시도해도 소용없으면 None 반환"""
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        retry_after = _parse_retry_after(error.resp.get('retry-after'))
+        if status in RETRYABLE_STATUS:
+            return RetryableError(retry_after, rate_limited=status == 429)
+        if status == 403:
+            reasons = {detail.get('reason') for detail in (error.error_details or [])
+                       if isinstance(detail, dict)}
+            if reasons & GOOGLE_RATE_LIMIT_REASONS:
+                return RetryableError(retry_after, rate_limited=True)
+        return None
+
+    # notion_client(와 그 안의 Client, httpx)는 import만으로도 느리므로 여기서 불러오지 않습니다.
+    # 아직 불러오지 않았다면 그 모듈의 오류일 수 없습니다.
+    notion_errors = sys.modules.get('notion_client.errors')
+    if notion_errors is not None:
+        if isinstance(error, notion_errors.APIResponseError):
+            code = getattr(error.code, 'value', error.code)
+            if code in NOTION_RETRYABLE_CODES or error.status in RETRYABLE_STATUS:
+                return RetryableError(_parse_retry_after(error.headers.get('Retry-After')),
+                                      rate_limited=code == 'rate_limited')
+            return None
+
+        if isinstance(error, notion_errors.HTTPResponseError):
+            # JSON 본문이 없는 게이트웨이 오류 등
+            if error.status in RETRYABLE_STATUS:
+                return RetryableError(_parse_retry_after(error.headers.get('Retry-After')),
+                                      rate_limited=error.status == 429)
+            return None
+
+        if isinstance(error, notion_errors.RequestTimeoutError):
+            return RetryableError()
+
+    httpx = sys.modules.get('httpx')
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return RetryableError()
+
+    if isinstance(error, (socket.timeout, ConnectionError, TimeoutError)):
+        return RetryableError()
+
+    return None
+
+def was_rejected(error: Exception) -> bool:
+    """서버가 요청을 반영하지 않고 거절한 일시적인 오류인지
+
+    insert처럼 다시 보내면 중복이 생기는 요청은 이때만 그대로 다시 보낼 수 있습니다.
+    """
+    retryable = classify(error)
+    if retryable is None:
+        return False
+    if retryable.rate_limited:
+        return True
+    resp = getattr(error, 'resp', None)
+    status = resp.status if resp is not None else getattr(error, 'status', None)
+    return status in REJECTED_STATUS
+
+class RetryPolicy:
+    """지수 백오프 + 지터로 일시적인 API 오류를 다시 시도하는 정책
+
+    max_attempts번까지 시도하며, 첫 호출부터 deadline초가 지나면 더 기다리지 않고
+    마지막 오류를 그대로 올립니다. 서버가 Retry-After를 주면 그보다 먼저 다시
+    시도하지 않습니다.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 30.0, deadline: float = 120.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, attempt: int, retryable: RetryableError) -> float:
+        """attempt번째(0부터) 실패 후 기다릴 시간 (full jitter)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retryable.retry_after is not None:
+            delay = max(delay, retryable.retry_after)
+        return delay
+
+    def next_delay(self, error: Exception, attempt: int, started: float,
+                   idempotent: bool = True) -> Optional[float]:
+        """다시 시도한다면 기다릴 시간, 포기해야 하면 None
+
+        idempotent=False인 요청은 서버가 거절했음이 확실한 오류(was_rejected)만 다시 시도합니다.
+        """
+        retryable = classify(error)
+        if retryable is None or attempt + 1 >= self.max_attempts:
+            return None
+        if not idempotent and not was_rejected(error):
+            return None
+        delay = self.backoff(attempt, retryable)
+        if time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+    def call(self, fn: Callable, *args, idempotent: bool = True, **kwargs):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self.next_delay(e, attempt, started, idempotent)
+                if delay is None:
+                    raise
+                logger.warning(f"일시적인 오류로 {delay:.1f}초 후 다시 시도합니다 "
+                               f"({attempt + 1}/{self.max_attempts}): {e}")
+                time.sleep(delay)
+                attempt += 1
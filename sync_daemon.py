@@ -0,0 +1,143 @@
+import os
+import hmac
+import json
+import signal
+import hashlib
+import logging
+import ipaddress
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 데몬 모드 폴링 간격 (초)
+MIN_POLL_INTERVAL = 30
+MAX_POLL_INTERVAL = 15 * 60
+
+# Notion 웹훅 구독을 만들 때 받은 verification_token (서명 검증용)
+NOTION_WEBHOOK_SECRET = os.environ.get('NOTION_WEBHOOK_SECRET')
+
+# 웹훅 서버가 기본으로 받는 주소 (외부에서 받으려면 리버스 프록시나 --webhook-host 사용)
+DEFAULT_WEBHOOK_HOST = '127.0.0.1'
+
+class AdaptiveInterval:
+    """변경이 있으면 최소 간격으로 줄이고, 없으면 최대 간격까지 두 배씩 늘리는 폴링 간격"""
+
+    def __init__(self, minimum: float = MIN_POLL_INTERVAL, maximum: float = MAX_POLL_INTERVAL):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current = minimum
+
+    def update(self, changes: int) -> float:
+        if changes:
+            self.current = self.minimum
+        else:
+            self.current = min(self.current * 2, self.maximum)
+        return self.current
+
+def verify_notion_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """X-Notion-Signature 헤더(sha256=HMAC) 검증"""
+    if not signature:
+        return False
+    expected = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+def is_loopback(host: str) -> bool:
+    """이 컴퓨터 안에서만 접속할 수 있는 주소인지"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def start_webhook_server(port: int, trigger: threading.Event, host: str = DEFAULT_WEBHOOK_HOST,
+                         secret: Optional[str] = NOTION_WEBHOOK_SECRET) -> ThreadingHTTPServer:
+    """Notion 웹훅을 받으면 trigger를 설정해 다음 폴링을 바로 시작하게 하는 로컬 HTTP 서버
+
+    서명을 검증할 secret이 없으면 누구의 요청이든 동기화를 시작시키므로, 그때는
+    루프백 주소에서만 받습니다.
+    """
+    if not secret and not is_loopback(host):
+        raise ValueError(f"NOTION_WEBHOOK_SECRET 없이 {host}에서 웹훅을 받을 수 없습니다.")
+
+    class NotionWebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            try:
+                payload = json.loads(body or b'{}')
+            except json.JSONDecodeError:
+                self.send_response(400)
+                self.end_headers()
+                return
+
+            if 'verification_token' in payload:
+                # 구독 생성 시 한 번 오는 확인 요청: 토큰을 Notion 설정 화면에 입력해야 합니다.
+                logger.info(f"Notion 웹훅 verification_token: {payload['verification_token']}")
+            elif secret and not verify_notion_signature(body, self.headers.get('X-Notion-Signature'), secret):
+                logger.warning("서명이 올바르지 않은 웹훅 요청을 무시합니다.")
+                self.send_response(401)
+                self.end_headers()
+                return
+            else:
+                logger.info(f"Notion 웹훅 수신: {payload.get('type', '알 수 없음')}")
+                trigger.set()
+
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), NotionWebhookHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Notion 웹훅을 {host}:{port}에서 기다립니다.")
+    return server
+
+def run_daemon(sync, min_interval: float = MIN_POLL_INTERVAL, max_interval: float = MAX_POLL_INTERVAL,
+               webhook_port: Optional[int] = None, metrics_file: Optional[str] = None,
+               webhook_host: str = DEFAULT_WEBHOOK_HOST, full: bool = False):
+    """하나의 NotionGoogleTasksSync 인스턴스로 증분 동기화를 계속 반복
+
+    변경이 있으면 간격을 줄이고 한가하면 늘리며, 웹훅을 받으면 기다리지 않고
+    바로 다음 동기화를 실행합니다. SIGINT/SIGTERM을 받으면 현재 동기화를 마치고 끝냅니다.
+    metrics_file을 주면 동기화가 끝날 때마다 그 실행의 통계로 덮어씁니다.
+    full=True이면 첫 동기화만 전체 데이터를 다시 확인합니다.
+    """
+    interval = AdaptiveInterval(min_interval, max_interval)
+    trigger = threading.Event()
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        logger.info("종료 신호를 받아 데몬을 멈춥니다.")
+        stopping.set()
+        trigger.set()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    server = start_webhook_server(webhook_port, trigger, webhook_host) if webhook_port else None
+    try:
+        while not stopping.is_set():
+            try:
+                changes = sync.sync_tasks(full=full)
+                full = False
+            except Exception as e:
+                logger.error(f"동기화 실패: {str(e)}")
+                changes = 0
+            for error in sync.errors:
+                logger.warning(error)
+            if metrics_file:
+                try:
+                    sync.metrics.export(metrics_file)
+                except OSError as e:
+                    logger.warning(f"실행 통계 저장 실패: {str(e)}")
+
+            wait = interval.update(changes)
+            logger.info(f"변경 {changes}건, {wait:.0f}초 후 다시 확인합니다.")
+            trigger.wait(wait)
+            trigger.clear()
+    finally:
+        if server:
+            server.shutdown()
@@ -0,0 +1,75 @@
+import json
+import hashlib
+from typing import Dict, Optional, Tuple
+
+# 양쪽에서 비교하는 필드
+SYNC_FIELDS = ('title', 'due', 'completed')
+
+def content_key(notion_id: str, title: str, due: Optional[str], notes: str) -> str:
+    """Google Task 본문의 중복 확인 키: 'Notion ID:제목/마감일/notes 해시'
+
+    같은 Notion 페이지로 같은 내용의 작업을 만들면 항상 같은 키가 나오므로,
+    제목이 같은 다른 작업(반복되는 습관 등)과는 구분됩니다.
+    """
+    content = json.dumps([title, (due or '')[:10], notes], ensure_ascii=False)
+    return f"{notion_id}:{hashlib.sha256(content.encode()).hexdigest()[:16]}"
+
+def diff_records(notion: Dict, google: Dict, base: Optional[Dict],
+                 notion_newer: bool) -> Tuple[Dict, Dict]:
+    """마지막 동기화 상태(base)와 비교해 양쪽에 보낼 필드별 변경 계산
+
+    한쪽만 바뀐 필드는 바뀐 쪽 값을 다른 쪽에 보내고, 양쪽 모두 바뀐 필드는
+    더 최근에 수정된 쪽(notion_newer)이 이깁니다. base가 없으면(처음 연결된 작업)
+    제목/날짜는 Notion, 완료 여부는 완료된 쪽을 따릅니다.
+    (Google에 보낼 변경, Notion에 보낼 변경)을 반환합니다.
+    """
+    to_google, to_notion = {}, {}
+    for field in SYNC_FIELDS:
+        notion_value, google_value = notion[field], google[field]
+        if notion_value == google_value:
+            continue
+
+        if base is None:
+            if field == 'completed':
+                notion_wins = notion_value
+            else:
+                notion_wins = True
+        else:
+            notion_changed = notion_value != base.get(field)
+            google_changed = google_value != base.get(field)
+            if notion_changed and google_changed:
+                notion_wins = notion_newer
+            else:
+                notion_wins = notion_changed
+
+        if notion_wins:
+            to_google[field] = notion_value
+        else:
+            to_notion[field] = google_value
+    return to_google, to_notion
+
+def google_patch_body(changes: Dict) -> Dict:
+    """필드 변경을 tasks().patch 본문으로 변환"""
+    body = {}
+    if 'title' in changes:
+        body['title'] = changes['title']
+    if 'due' in changes:
+        body['due'] = f"{changes['due']}T00:00:00.000Z" if changes['due'] else None
+    if 'completed' in changes:
+        if changes['completed']:
+            body['status'] = 'completed'
+        else:
+            body['status'] = 'needsAction'
+            body['completed'] = None
+    return body
+
+def notion_properties(changes: Dict) -> Dict:
+    """필드 변경을 pages.update 속성으로 변환"""
+    properties = {}
+    if 'title' in changes:
+        properties['이름'] = {"title": [{"text": {"content": changes['title']}}]}
+    if 'due' in changes:
+        properties['날짜'] = {"date": {"start": changes['due']} if changes['due'] else None}
+    if 'completed' in changes:
+        properties['완료여부'] = {"checkbox": changes['completed']}
+    return properties
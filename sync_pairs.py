@@ -0,0 +1,130 @@
+import os
+import html
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from metrics import SyncMetrics
+from sync_state import SYNC_STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+# 여러 쌍을 동시에 동기화할 최대 작업자 스레드 수
+SYNC_WORKERS = int(os.environ.get('SYNC_WORKERS', 8))
+
+# 작업 목록 ID가 없을 때 찾거나 만들 목록 이름
+DEFAULT_TASKLIST_TITLE = os.environ.get('GOOGLE_TASKLIST_TITLE', '습관')
+
+class SyncPair:
+    """동기화할 Notion 데이터베이스와 Google 작업 목록 한 쌍의 설정
+
+    notion_token_env에는 Notion 토큰이 담긴 환경 변수 이름을 적어 설정 파일에
+    비밀 값이 들어가지 않게 하고, google_token_file로 사용자별 OAuth 토큰을 고릅니다.
+    """
+
+    def __init__(self, name: str, database_id: str, tasklist_id: Optional[str] = None,
+                 tasklist_title: str = DEFAULT_TASKLIST_TITLE, notion_token: Optional[str] = None,
+                 google_token_file: str = 'token.json', state_dir: Optional[str] = None):
+        self.name = name
+        self.database_id = database_id
+        self.tasklist_id = tasklist_id
+        self.tasklist_title = tasklist_title
+        self.notion_token = notion_token
+        self.google_token_file = google_token_file
+        # 쌍마다 워터마크와 연결 색인을 따로 보관합니다.
+        self.state_dir = state_dir or os.path.join(SYNC_STATE_DIR, name)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SyncPair':
+        token_env = data.get('notion_token_env', 'NOTION_TOKEN')
+        notion_token = os.environ.get(token_env)
+        if not notion_token:
+            raise ValueError(f"'{data['name']}'의 Notion 토큰 환경 변수 {token_env}가 없습니다.")
+        return cls(
+            name=data['name'],
+            database_id=data['database_id'],
+            tasklist_id=data.get('tasklist_id'),
+            tasklist_title=data.get('tasklist_title', DEFAULT_TASKLIST_TITLE),
+            notion_token=notion_token,
+            google_token_file=data.get('google_token_file', 'token.json'),
+        )
+
+def load_pairs(path: str) -> List[SyncPair]:
+    """JSON 설정 파일에서 동기화 쌍 목록 읽기
+
+    {"pairs": [{"name": "habits", "database_id": "...", "tasklist_id": "...",
+                "notion_token_env": "NOTION_TOKEN", "google_token_file": "token.json"}, ...]}
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    pairs = [SyncPair.from_dict(item) for item in config['pairs']]
+    names = [pair.name for pair in pairs]
+    if len(names) != len(set(names)):
+        raise ValueError("동기화 쌍의 name은 서로 달라야 합니다.")
+    return pairs
+
+class MultiPairSync:
+    """여러 동기화 쌍을 각자의 작업자 스레드에서 동시에 실행
+
+    쌍마다 자신의 클라이언트, 상태 디렉터리, 실행 통계를 가진 NotionGoogleTasksSync를
+    쓰고, 같은 Notion 토큰을 쓰는 쌍끼리는 요청 한도(TokenBucket)를 함께 씁니다.
+    전체 실행 시간은 가장 느린 쌍을 따르며, 한 쌍이 실패해도 나머지는 계속 진행합니다.
+    NotionGoogleTasksSync와 같은 sync_tasks()/errors/metrics를 제공하므로 데몬 모드에도
+    그대로 넘길 수 있습니다.
+    """
+
+    def __init__(self, syncs: Dict[str, object], workers: int = SYNC_WORKERS):
+        self.syncs = syncs
+        self.workers = max(1, min(workers, len(syncs)))
+        self.errors: List[str] = []
+        self.metrics = SyncMetrics()
+
+    def sync_tasks(self, full: bool = False) -> int:
+        """모든 쌍을 동기화하고 기록한 변경 수의 합계 반환"""
+        self.errors = []
+        self.metrics.reset()
+        total = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sync-pair') as pool:
+            futures = {pool.submit(sync.sync_tasks, full): name for name, sync in self.syncs.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    total += future.result()
+                except Exception as e:
+                    logger.error(f"[{name}] 동기화 실패: {str(e)}")
+                    self.errors.append(f"[{name}] 동기화 실패: {str(e)}")
+
+        for name, sync in self.syncs.items():
+            self.errors.extend(f"[{name}] {error}" for error in sync.errors)
+            self.metrics.merge(sync.metrics)
+        self.metrics.finish()
+        return total
+
+    def plan_report(self) -> Dict:
+        """쌍별 --plan 결과와 전체 예상 비용
+
+        쌍은 동시에 실행되므로 전체 시간은 가장 느린 쌍을 따르지만, 같은 Notion 토큰을
+        쓰는 쌍의 Notion 기록은 요청 한도를 나눠 쓰므로 그 시간은 더해서 비교합니다.
+        """
+        pairs = {name: sync.plan_report() for name, sync in self.syncs.items()}
+        notion_seconds: Dict[str, float] = {}
+        for name, sync in self.syncs.items():
+            token = sync.pair.notion_token
+            notion_seconds[token] = notion_seconds.get(token, 0.0) + pairs[name]['estimated_seconds']['notion']
+        slowest = max((report['estimated_seconds']['total'] for report in pairs.values()), default=0.0)
+        return {
+            'pairs': pairs,
+            'total_requests': sum(report['api_calls']['total_requests'] for report in pairs.values()),
+            'estimated_seconds': max(slowest, max(notion_seconds.values(), default=0.0)),
+        }
+
+    def summary(self) -> str:
+        """쌍별 처리 결과 한 줄씩 (텔레그램 보고서용)"""
+        lines = []
+        for name, sync in self.syncs.items():
+            items = sync.metrics.items
+            lines.append(f"• {html.escape(name)}: 추가 {items.get('tasks_created', 0)}개, "
+                         f"완료 {items.get('tasks_completed', 0)}개, "
+                         f"{sync.metrics.duration:.1f}초")
+        return '\n'.join(lines)
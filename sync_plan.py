@@ -0,0 +1,107 @@
+import math
+from typing import Dict, List, Optional
+
+from metrics import SyncMetrics
+
+# 읽기 요청으로 지연 시간을 재지 못했을 때 가정하는 Google 쓰기 요청 하나의 시간(초)
+DEFAULT_GOOGLE_WRITE_SECONDS = 0.3
+
+class SyncPlan:
+    """--plan 실행에서 기록하는 대신 모아 두는 쓰기 작업 목록
+
+    동기화는 읽기 단계를 그대로 실행하고, Google/Notion에 쓰는 자리마다 요청을
+    보내는 대신 여기에 기록합니다. to_dict()는 작업 목록과 함께 예상 API 호출 수와
+    현재 요청 한도에서의 예상 실행 시간을 JSON으로 바꿀 수 있는 dict로 반환합니다.
+    """
+
+    def __init__(self, google_batch_size: int, notion_rate: float):
+        self.google_batch_size = google_batch_size
+        self.notion_rate = notion_rate
+        # 증분 실행의 기준 시각 (전체 확인이면 None)
+        self.since: Optional[str] = None
+        # 새로 만들 태스크 리스트 이름
+        self.tasklist_title: Optional[str] = None
+        self.creates: List[Dict] = []
+        self.google_updates: List[Dict] = []
+        self.notion_updates: List[Dict] = []
+        self.repairs: List[Dict] = []
+        self.resets: List[Dict] = []
+
+    def create_tasklist(self, title: str):
+        """설정한 이름의 태스크 리스트가 없어 새로 만들 리스트"""
+        self.tasklist_title = title
+
+    def create(self, notion_id: str, title: str, due: Optional[str]):
+        """Google Tasks에 추가할 작업 (추가 후 Notion remark/업로드 상태도 기록됨)"""
+        self.creates.append({'notion_id': notion_id, 'title': title, 'due': due})
+
+    def update_google(self, task_id: str, notion_id: str, title: str, changes: Dict):
+        self.google_updates.append({'task_id': task_id, 'notion_id': notion_id, 'title': title,
+                                    'changes': changes})
+
+    def update_notion(self, page_id: str, properties: Dict):
+        self.notion_updates.append({'page_id': page_id, 'properties': properties})
+
+    def repair(self, kind: str, notion_id: str, task_id: str, title: Optional[str] = None):
+        """연결 복구 (kind: Google notes를 고치는 'google_notes', Notion에 연결만 기록하는 'notion_link')"""
+        self.repairs.append({'kind': kind, 'notion_id': notion_id, 'task_id': task_id, 'title': title})
+
+    def reset(self, notion_id: str, title: Optional[str] = None):
+        """Google Task가 없어 업로드 상태를 초기화할 작업"""
+        self.resets.append({'notion_id': notion_id, 'title': title})
+
+    def write_calls(self) -> Dict[str, int]:
+        """실제 실행에서 보낼 쓰기 요청 수 (엔드포인트별)"""
+        # 추가한 작업의 Notion 기록은 같은 페이지의 다른 변경과 한 요청으로 합쳐집니다.
+        notion_pages = {update['page_id'] for update in self.notion_updates}
+        extra_pages = sum(1 for create in self.creates if create['notion_id'] not in notion_pages)
+        google_patches = len(self.google_updates) + sum(1 for repair in self.repairs
+                                                        if repair['kind'] == 'google_notes')
+        calls = {
+            'tasklists.insert': 1 if self.tasklist_title else 0,
+            'tasks.batch': math.ceil(len(self.creates) / self.google_batch_size),
+            'tasks.insert': len(self.creates),
+            'tasks.patch': google_patches,
+            'pages.update': len(self.notion_updates) + extra_pages,
+        }
+        return {endpoint: count for endpoint, count in calls.items() if count}
+
+    def estimate_seconds(self, metrics: SyncMetrics) -> Dict[str, float]:
+        """읽기는 이번 실행에서 잰 시간, 쓰기는 요청 한도와 측정한 지연 시간으로 추정
+
+        Notion 기록은 요청 한도(초당 notion_rate회)가, Google 요청은 한 번에 하나씩
+        보내므로 요청 수 × 읽기 요청의 평균 지연 시간이 실행 시간을 정합니다.
+        """
+        calls = self.write_calls()
+        google_latencies = [seconds for endpoint, values in metrics.latencies.items()
+                            if endpoint.startswith(('tasks.', 'tasklists.')) for seconds in values]
+        google_seconds = (sum(google_latencies) / len(google_latencies) if google_latencies
+                          else DEFAULT_GOOGLE_WRITE_SECONDS)
+        writes = {
+            'google': (calls.get('tasklists.insert', 0) + calls.get('tasks.batch', 0)
+                       + calls.get('tasks.patch', 0)) * google_seconds,
+            'notion': calls.get('pages.update', 0) / self.notion_rate,
+        }
+        reads = metrics.duration
+        return {'reads': reads, **writes, 'total': reads + sum(writes.values())}
+
+    def to_dict(self, metrics: SyncMetrics) -> Dict:
+        write_calls = self.write_calls()
+        read_calls = {endpoint: len(values) for endpoint, values in sorted(metrics.latencies.items())}
+        return {
+            'since': self.since,
+            'create_tasklist': self.tasklist_title,
+            'creates': self.creates,
+            'updates': {'google': self.google_updates, 'notion': self.notion_updates},
+            'repairs': self.repairs,
+            'resets': self.resets,
+            'api_calls': {
+                'reads': read_calls,
+                'writes': write_calls,
+                # 배치에 묶인 tasks.insert는 HTTP 요청이 아니라 tasks.batch로 셉니다.
+                'total_requests': (sum(read_calls.values()) + sum(write_calls.values())
+                                   - write_calls.get('tasks.insert', 0)),
+            },
+            'estimated_seconds': self.estimate_seconds(metrics),
+            'notion_rate_limit': self.notion_rate,
+        }
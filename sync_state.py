@@ -0,0 +1,178 @@
+import os
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 실행 사이에 유지되는 동기화 상태 디렉터리 (GitHub Actions에서는 캐시로 보존)
+SYNC_STATE_DIR = os.environ.get('SYNC_STATE_DIR', '.sync_state')
+
+# Notion의 last_edited_time은 분 단위로 기록되므로 워터마크를 조금 앞당겨 저장합니다.
+WATERMARK_MARGIN = timedelta(minutes=2)
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def format_timestamp(value: datetime) -> str:
+    """Notion 필터와 Google Tasks updatedMin 모두 받아들이는 RFC 3339 형식으로 변환"""
+    return value.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+class SyncState:
+    """실행 간 동기화 워터마크를 JSON 파일로 보관"""
+
+    def __init__(self, database_id: str, tasklist_id: str, state_dir: str = None):
+        self.database_id = database_id
+        self.tasklist_id = tasklist_id
+        self.state_dir = state_dir or SYNC_STATE_DIR
+        self.path = os.path.join(self.state_dir, 'sync_state.json')
+        self.data: Dict = {}
+
+    def load(self) -> 'SyncState':
+        try:
+            with open(self.path, 'r') as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            self.data = {}
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"동기화 상태 파일을 읽을 수 없어 전체 동기화를 수행합니다: {e}")
+            self.data = {}
+        return self
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """마지막으로 성공한 동기화 시각 (다른 데이터베이스/리스트의 상태라면 None)"""
+        if self.data.get('database_id') != self.database_id or \
+           self.data.get('tasklist_id') != self.tasklist_id:
+            return None
+        return self.data.get('watermark')
+
+    def save_watermark(self, run_started: datetime):
+        """이번 실행 시작 시각을 기준으로 다음 실행의 워터마크 저장"""
+        self.data.update({
+            'database_id': self.database_id,
+            'tasklist_id': self.tasklist_id,
+            'watermark': format_timestamp(run_started - WATERMARK_MARGIN)
+        })
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+class IdMapStore:
+    """Notion 페이지 ID <-> Google Task ID 연결 정보를 SQLite 파일로 보관
+
+    notes/remark 문자열을 파싱하거나 Notion을 다시 조회하지 않고 연결된 ID를
+    바로 찾기 위한 색인입니다. 파일이 없어지면 빈 상태로 다시 만들어지며,
+    is_empty()일 때 호출자가 텍스트 표식으로부터 다시 채웁니다.
+    in_memory=True이면 파일 내용을 메모리로 복사해 쓰고 변경은 파일에 저장하지 않습니다
+    (--plan 실행용).
+    """
+
+    def __init__(self, database_id: str, tasklist_id: str, state_dir: str = None, in_memory: bool = False):
+        self.state_dir = state_dir or SYNC_STATE_DIR
+        self.path = os.path.join(self.state_dir, 'id_map.sqlite3')
+        if in_memory:
+            self.conn = sqlite3.connect(':memory:', isolation_level=None, check_same_thread=False)
+            if os.path.exists(self.path):
+                source = sqlite3.connect(self.path)
+                source.backup(self.conn)
+                source.close()
+        else:
+            os.makedirs(self.state_dir, exist_ok=True)
+            self.conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS links (
+                notion_id TEXT PRIMARY KEY,
+                google_id TEXT NOT NULL UNIQUE,
+                etag TEXT,
+                updated TEXT,
+                synced TEXT
+            )
+        """)
+        # synced 열이 없던 이전 버전의 색인 파일에 열 추가
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(links)")}
+        if 'synced' not in columns:
+            self.conn.execute("ALTER TABLE links ADD COLUMN synced TEXT")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._bind(database_id, tasklist_id)
+
+    def _bind(self, database_id: str, tasklist_id: str):
+        """다른 데이터베이스/리스트용으로 만들어진 색인이면 비웁니다."""
+        scope = f"{database_id}:{tasklist_id}"
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'scope'").fetchone()
+        if row and row[0] == scope:
+            return
+        if row:
+            logger.warning("ID 매핑 색인의 대상이 바뀌어 색인을 초기화합니다.")
+        self.conn.execute("BEGIN")
+        self.conn.execute("DELETE FROM links")
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('scope', ?)", (scope,))
+        self.conn.execute("COMMIT")
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM links LIMIT 1").fetchone() is None
+
+    def google_id_for(self, notion_id: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT google_id FROM links WHERE notion_id = ?", (notion_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def notion_id_for(self, google_id: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT notion_id FROM links WHERE google_id = ?", (google_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    # 같은 연결이면 마지막 동기화 상태(synced)를 유지하고, 연결 대상이 바뀌면 버립니다.
+    _UPSERT = """
+        INSERT INTO links (notion_id, google_id, etag, updated) VALUES (?, ?, ?, ?)
+        ON CONFLICT(notion_id) DO UPDATE SET
+            synced = CASE WHEN links.google_id = excluded.google_id THEN links.synced END,
+            google_id = excluded.google_id,
+            etag = excluded.etag,
+            updated = excluded.updated
+    """
+
+    def _upsert(self, notion_id: str, google_id: str, etag: Optional[str], updated: Optional[str]):
+        # 같은 Google ID가 다른 Notion 페이지에 연결되어 있었다면 그 연결은 제거합니다.
+        self.conn.execute("DELETE FROM links WHERE google_id = ? AND notion_id != ?", (google_id, notion_id))
+        self.conn.execute(self._UPSERT, (notion_id, google_id, etag, updated))
+
+    def record(self, notion_id: str, google_id: str, etag: str = None, updated: str = None):
+        """연결 정보 저장 (같은 Notion ID나 Google ID의 기존 연결은 대체)"""
+        self._upsert(notion_id, google_id, etag, updated)
+
+    def record_many(self, links: Iterable[Tuple[str, str, Optional[str], Optional[str]]]):
+        """(notion_id, google_id, etag, updated) 목록을 한 트랜잭션으로 저장"""
+        self.conn.execute("BEGIN")
+        try:
+            for link in links:
+                self._upsert(*link)
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def synced_state(self, notion_id: str) -> Optional[Dict]:
+        """마지막으로 양쪽이 일치했던 필드 값 (sync_diff의 비교 기준)"""
+        row = self.conn.execute(
+            "SELECT synced FROM links WHERE notion_id = ?", (notion_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def save_synced_state(self, notion_id: str, record: Dict):
+        self.conn.execute(
+            "UPDATE links SET synced = ? WHERE notion_id = ?",
+            (json.dumps(record, ensure_ascii=False), notion_id)
+        )
+
+    def remove(self, notion_id: str):
+        self.conn.execute("DELETE FROM links WHERE notion_id = ?", (notion_id,))
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,247 @@
+import os
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+# 동기화와 보조 스크립트가 모두 같은 범위로 토큰을 갱신합니다.
+# (좁은 범위로 갱신하면 다음 만료까지 쓰기 요청이 403으로 실패합니다)
+GOOGLE_TASKS_SCOPES = ['https://www.googleapis.com/auth/tasks']
+
+# 액세스 토큰 만료 몇 초 전에 미리 갱신할지
+REFRESH_MARGIN = float(os.environ.get('GOOGLE_TOKEN_REFRESH_MARGIN', 300))
+
+# 401 응답으로 갱신을 요청받아도 이 시간(초) 안에 이미 갱신했다면 다시 갱신하지 않음
+MIN_REFRESH_INTERVAL = 30
+
+# 백그라운드 갱신이 실패했을 때 다시 시도할 간격(초)
+REFRESH_RETRY_DELAY = 60
+
+class TokenError(Exception):
+    """Google 인증 정보를 불러오거나 갱신할 수 없음"""
+
+def _utcnow() -> datetime:
+    # google-auth의 expiry는 시간대 없는 UTC datetime입니다.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class TokenManager:
+    """토큰 파일 하나의 Google OAuth 인증 정보를 캐시하고 만료 전에 미리 갱신
+
+    액세스 토큰과 만료 시각을 메모리에 두고, 만료 refresh_margin초 전부터는
+    credentials()가 갱신된 토큰을 돌려줍니다. 갱신은 잠금 안에서 한 번만 실행되므로
+    여러 작업자 스레드(또는 acredentials()를 쓰는 코루틴)가 동시에 요청해도 나머지는
+    그 결과를 함께 씁니다. 갱신된 토큰은 파일에 바로 저장하고, start()하면 백그라운드
+    스레드가 만료 전에 갱신해 두어 실행 도중 토큰이 만료되지 않습니다.
+    """
+
+    def __init__(self, token_file: str = 'token.json', scopes=GOOGLE_TASKS_SCOPES,
+                 refresh_margin: float = REFRESH_MARGIN,
+                 on_refresh: Optional[Callable[['Credentials'], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.token_file = token_file
+        self.scopes = list(scopes)
+        self.refresh_margin = refresh_margin
+        self.on_refresh = on_refresh
+        self.on_error = on_error
+        self._creds: Optional['Credentials'] = None
+        self._refreshed_at = 0.0
+        self._failing = False
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _load(self) -> Optional['Credentials']:
+        from google.oauth2.credentials import Credentials
+        if not os.path.exists(self.token_file):
+            return None
+        try:
+            return Credentials.from_authorized_user_file(self.token_file, self.scopes)
+        except Exception as e:
+            raise TokenError(f"토큰 파일 {self.token_file} 로드 실패: {str(e)}") from e
+
+    def _save(self, creds: 'Credentials'):
+        # 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 임시 파일을 거쳐 교체합니다.
+        temp_path = f"{self.token_file}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(creds.to_json())
+        os.replace(temp_path, self.token_file)
+
+    def _authorize(self) -> 'Credentials':
+        """브라우저로 새로 인증해 토큰 파일 생성"""
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        try:
+            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', self.scopes)
+            creds = flow.run_local_server(port=0)
+        except Exception as e:
+            raise TokenError(f"새 토큰 생성 실패: {str(e)}") from e
+        self._save(creds)
+        logger.info(f"새로운 토큰을 {self.token_file}에 저장했습니다.")
+        return creds
+
+    def seconds_left(self) -> Optional[float]:
+        """캐시된 액세스 토큰의 남은 유효 시간 (토큰이 없으면 None)"""
+        creds = self._creds
+        if creds is None or creds.token is None:
+            return None
+        if creds.expiry is None:
+            return float('inf')
+        return (creds.expiry - _utcnow()).total_seconds()
+
+    def _needs_refresh(self) -> bool:
+        left = self.seconds_left()
+        return left is None or left <= self.refresh_margin
+
+    def _ensure_loaded(self, interactive: bool):
+        if self._creds is not None:
+            return
+        creds = self._load()
+        if creds is None or not (creds.refresh_token or creds.valid):
+            if not interactive:
+                raise TokenError(f"{self.token_file}에 사용할 수 있는 토큰이 없습니다. 재인증이 필요합니다.")
+            creds = self._authorize()
+        self._creds = creds
+
+    def _refresh_locked(self):
+        from google.auth.transport.requests import Request
+        try:
+            if not self._creds.refresh_token:
+                raise TokenError("리프레시 토큰이 없습니다. 재인증이 필요합니다.")
+            self._creds.refresh(Request())
+            self._save(self._creds)
+        except Exception as e:
+            # 연속된 실패는 처음 한 번만 알립니다.
+            if not self._failing and self.on_error:
+                self.on_error(e)
+            self._failing = True
+            if isinstance(e, TokenError):
+                raise
+            raise TokenError(f"토큰 갱신 실패: {str(e)}") from e
+        self._failing = False
+        self._refreshed_at = time.monotonic()
+        logger.info(f"Google 토큰을 갱신했습니다 (만료: {self._creds.expiry}).")
+        if self.on_refresh:
+            self.on_refresh(self._creds)
+
+    def credentials(self, interactive: bool = False) -> 'Credentials':
+        """유효한 인증 정보 반환 (만료가 가까우면 먼저 갱신)
+
+        interactive=True이면 쓸 수 있는 토큰이 없을 때 브라우저 인증을 시작합니다.
+        """
+        creds = self._creds
+        if creds is not None and not self._needs_refresh():
+            return creds
+        with self._lock:
+            self._ensure_loaded(interactive)
+            # 잠금을 기다리는 동안 다른 스레드가 이미 갱신했을 수 있습니다.
+            if self._needs_refresh():
+                self._refresh_locked()
+            return self._creds
+
+    def refresh(self, force: bool = False) -> 'Credentials':
+        """만료가 가깝거나 force=True이면 갱신
+
+        force=True여도 MIN_REFRESH_INTERVAL 안에 갱신한 적이 있으면 그 토큰을 씁니다
+        (401 응답을 받은 여러 요청이 한꺼번에 갱신하지 않도록).
+        """
+        with self._lock:
+            self._ensure_loaded(interactive=False)
+            recently = time.monotonic() - self._refreshed_at < MIN_REFRESH_INTERVAL
+            if (force and not recently) or self._needs_refresh():
+                self._refresh_locked()
+            return self._creds
+
+    async def acredentials(self) -> 'Credentials':
+        """credentials()의 비동기 버전 (갱신 요청은 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.credentials)
+
+    async def arefresh(self, force: bool = False) -> 'Credentials':
+        return await asyncio.to_thread(self.refresh, force)
+
+    def google_credentials(self):
+        """AuthorizedHttp에 넘길 인증 정보
+
+        요청마다 이 관리자에서 토큰을 가져오므로 같은 관리자를 쓰는 모든 클라이언트가
+        하나의 토큰과 갱신을 공유합니다.
+        """
+        from google.auth.credentials import Credentials as BaseCredentials
+        manager = self
+        # 토큰 파일에 문제가 있으면 첫 요청이 아니라 여기서 바로 알 수 있게 합니다.
+        self.credentials()
+
+        class ManagedCredentials(BaseCredentials):
+            @property
+            def valid(self) -> bool:
+                return not manager._needs_refresh()
+
+            @property
+            def expired(self) -> bool:
+                return manager._needs_refresh()
+
+            def refresh(self, request):
+                # 401 응답 등으로 google-auth가 갱신을 요청한 경우
+                manager.refresh(force=True)
+
+            def apply(self, headers: Dict, token: str = None):
+                headers['authorization'] = f"Bearer {token or manager.credentials().token}"
+
+            def before_request(self, request, method, url, headers):
+                self.apply(headers)
+
+        return ManagedCredentials()
+
+    def start(self):
+        """만료 전에 토큰을 갱신하는 백그라운드 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='google-token-refresh', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            left = self.seconds_left()
+            if left == float('inf'):
+                # 만료 시각이 없는 토큰은 갱신할 필요가 없습니다.
+                self._stop.wait()
+                return
+            delay = 0 if left is None else max(left - self.refresh_margin, 0)
+            if self._stop.wait(delay):
+                return
+            try:
+                self.refresh()
+            except TokenError as e:
+                logger.error(f"백그라운드 토큰 갱신 실패: {str(e)}")
+                if self._stop.wait(REFRESH_RETRY_DELAY):
+                    return
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+_managers: Dict[str, TokenManager] = {}
+_managers_lock = threading.Lock()
+
+def get_token_manager(token_file: str = 'token.json', **kwargs) -> TokenManager:
+    """토큰 파일마다 하나씩 만들어 공유하는 TokenManager (kwargs는 처음 만들 때만 사용)"""
+    path = os.path.abspath(token_file)
+    with _managers_lock:
+        if path not in _managers:
+            _managers[path] = TokenManager(token_file, **kwargs)
+        return _managers[path]
+
+def stop_token_managers():
+    """실행을 마칠 때 모든 백그라운드 갱신 스레드 정지"""
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.stop()
@@ -0,0 +1,206 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import httplib2
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# 호스트별로 유지할 keep-alive 연결 수와 유휴 연결을 닫기까지의 시간 (초)
+MAX_KEEPALIVE_CONNECTIONS = 8
+KEEPALIVE_EXPIRY = 60.0
+HTTP_TIMEOUT = 60
+
+class ConnectionStats:
+    """클라이언트별 요청 수와 새로 연 연결 수 (나머지는 재사용된 연결)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.opened += 1
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.opened, 0)
+
+    def summary(self) -> str:
+        return f"{self.name}: 요청 {self.requests}회, 새 연결 {self.opened}개, 재사용 {self.reused}회"
+
+class CountingHttp(httplib2.Http):
+    """연결을 새로 여는지 재사용하는지 세는 httplib2.Http
+
+    httplib2.Http는 호스트별 연결을 self.connections에 보관해 재사용하므로,
+    요청을 보낼 때 소켓이 없으면 새 연결, 있으면 재사용으로 봅니다.
+    """
+
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def _conn_request(self, conn, request_uri, method, body, headers):
+        self.stats.record_request()
+        if conn.sock is None:
+            self.stats.record_connect()
+        return super()._conn_request(conn, request_uri, method, body, headers)
+
+def _httpx_event_hooks(stats: ConnectionStats, is_async: bool) -> Dict[str, List]:
+    """httpcore trace 확장으로 TCP 연결 생성을 세는 httpx event hook"""
+
+    def trace(event_name, info):
+        if event_name == 'connection.connect_tcp.started':
+            stats.record_connect()
+
+    async def async_trace(event_name, info):
+        trace(event_name, info)
+
+    def on_request(request: 'httpx.Request'):
+        stats.record_request()
+        request.extensions['trace'] = trace
+
+    async def async_on_request(request: 'httpx.Request'):
+        stats.record_request()
+        request.extensions['trace'] = async_trace
+
+    return {'request': [async_on_request if is_async else on_request]}
+
+class SharedTransport:
+    """실행(또는 데몬) 동안 Notion, Google, 텔레그램 클라이언트가 함께 쓰는 연결 계층
+
+    - httpx/httplib2 클라이언트는 keep-alive 연결 풀을 유지한 채 재사용합니다.
+    - 비동기 작업(Notion 작업자 풀, 텔레그램)은 하나의 백그라운드 이벤트 루프에서
+      실행되므로, 호출할 때마다 루프와 연결을 새로 만들지 않습니다.
+    - 클라이언트 종류별로 새로 연 연결과 재사용한 연결 수를 셉니다.
+    """
+
+    def __init__(self, max_keepalive: int = MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = KEEPALIVE_EXPIRY, timeout: float = HTTP_TIMEOUT):
+        # httpx는 Notion 클라이언트를 만들 때 불러옵니다 (시작 시간을 줄이기 위함).
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.stats = {name: ConnectionStats(name) for name in ('Notion', 'Google', 'Telegram')}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._http_clients: List['httpx.Client'] = []
+        self._async_clients: List['httpx.AsyncClient'] = []
+        self._google_https: List[CountingHttp] = []
+        self._bots: Dict[str, object] = {}
+
+    @property
+    def limits(self) -> 'httpx.Limits':
+        import httpx
+        return httpx.Limits(max_keepalive_connections=self.max_keepalive, keepalive_expiry=self.keepalive_expiry)
+
+    def notion_http_client(self) -> 'httpx.Client':
+        """notion_client.Client(client=...)에 넘길 동기 httpx 클라이언트
+
+        Notion 클라이언트가 인증 헤더와 base_url을 직접 설정하므로 Notion 클라이언트마다
+        하나씩 만들고, 각 클라이언트의 연결 풀은 실행 내내 유지됩니다.
+        """
+        import httpx
+        client = httpx.Client(limits=self.limits, event_hooks=_httpx_event_hooks(self.stats['Notion'], False))
+        with self._lock:
+            self._http_clients.append(client)
+        return client
+
+    def notion_async_http_client(self) -> 'httpx.AsyncClient':
+        """notion_client.AsyncClient(client=...)에 넘길 비동기 httpx 클라이언트"""
+        import httpx
+        client = httpx.AsyncClient(limits=self.limits, event_hooks=_httpx_event_hooks(self.stats['Notion'], True))
+        with self._lock:
+            self._async_clients.append(client)
+        return client
+
+    def google_http(self) -> CountingHttp:
+        """google_auth_httplib2.AuthorizedHttp로 감쌀 httplib2.Http (서비스 객체마다 하나)"""
+        http = CountingHttp(self.stats['Google'], timeout=self.timeout)
+        with self._lock:
+            self._google_https.append(http)
+        return http
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='shared-transport', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """코루틴을 공유 이벤트 루프에 넘기고 기다리지 않음"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """코루틴을 공유 이벤트 루프에서 실행하고 결과를 기다림 (동기 코드용)"""
+        return self.submit(coro).result(timeout)
+
+    async def telegram_bot(self, token: str):
+        """토큰별로 한 번만 초기화해 계속 쓰는 telegram.Bot (공유 루프 안에서 호출)"""
+        bot = self._bots.get(token)
+        if bot is None:
+            import telegram
+            from telegram.request import HTTPXRequest
+            request = HTTPXRequest(httpx_kwargs={
+                'limits': self.limits,
+                'event_hooks': _httpx_event_hooks(self.stats['Telegram'], True)
+            })
+            bot = telegram.Bot(token=token, request=request)
+            await bot.initialize()
+            self._bots[token] = bot
+        return bot
+
+    async def _aclose(self):
+        for bot in self._bots.values():
+            await bot.shutdown()
+        for client in self._async_clients:
+            await client.aclose()
+
+    def close(self):
+        """모든 연결을 닫고 백그라운드 이벤트 루프를 멈춤"""
+        if self._loop is not None:
+            try:
+                self.run(self._aclose(), timeout=10)
+            except Exception as e:
+                logger.warning(f"비동기 연결 정리 중 오류: {str(e)}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop.close()
+            self._loop = None
+        for client in self._http_clients:
+            client.close()
+        for http in self._google_https:
+            http.close()
+        self._bots.clear()
+        self._http_clients.clear()
+        self._async_clients.clear()
+        self._google_https.clear()
+
+    def summary(self) -> str:
+        return '\n'.join(stats.summary() for stats in self.stats.values() if stats.requests)
+
+_shared_transport: Optional[SharedTransport] = None
+_shared_lock = threading.Lock()
+
+def get_transport() -> SharedTransport:
+    """프로세스 전체에서 함께 쓰는 SharedTransport"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = SharedTransport()
+        return _shared_transport